@@ -1,9 +1,10 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_bcrypt import Bcrypt
+from flask_caching import Cache
 from celery import Celery
 import os
 from dotenv import load_dotenv
@@ -16,6 +17,7 @@ db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 bcrypt = Bcrypt()
+cache = Cache()
 
 def create_celery(app):
     """Create Celery instance for background tasks"""
@@ -24,7 +26,12 @@ def create_celery(app):
         backend=app.config['CELERY_RESULT_BACKEND'],
         broker=app.config['CELERY_BROKER_URL']
     )
-    celery.conf.update(app.config)
+    # Only pass Celery's own settings (CELERY_* keys, prefix stripped and lowercased)
+    celery.conf.update({
+        key[len('CELERY_'):].lower(): value
+        for key, value in app.config.items()
+        if key.startswith('CELERY_')
+    })
     
     class ContextTask(celery.Task):
         def __call__(self, *args, **kwargs):
@@ -38,6 +45,9 @@ def create_app(config_name='development'):
     """Application factory pattern"""
     app = Flask(__name__)
     
+    from app.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Configuration
     if config_name == 'production':
         app.config.from_object('app.config.ProductionConfig')
@@ -51,7 +61,20 @@ def create_app(config_name='development'):
     migrate.init_app(app, db)
     jwt.init_app(app)
     bcrypt.init_app(app)
-    CORS(app)
+    cache.init_app(app)
+    CORS(
+        app,
+        resources={r'/api/*': {'origins': app.config['CORS_ORIGINS']}},
+        methods=['GET', 'POST', 'PUT', 'DELETE'],
+        always_send=False
+    )
+    
+    # Serve '/api/alerts' and '/api/alerts/' alike instead of redirecting
+    app.url_map.strict_slashes = False
+    
+    @app.errorhandler(413)
+    def request_too_large(error):
+        return jsonify({'error': f"Request body exceeds {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
     
     # Register blueprints
     from app.api.auth import auth_bp
@@ -68,9 +91,10 @@ def create_app(config_name='development'):
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Create database tables outside production; Flask-Migrate owns the schema there
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with app.app_context():
+            db.create_all()
     
     return app
 
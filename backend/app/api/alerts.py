@@ -1,70 +1,159 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models import Alert, AlertRule, AlertHistory, User, Organization
+from app import db, cache
+from app.api.utils import (
+    get_current_identity, get_current_org_id,
+    paginate_keyset, paginate_rows, parse_enum, org_cache_key, invalidate_org_cache,
+    mark_org_cache_stale
+)
+from app.models import Alert, AlertRule, AlertHistory
 from app.models.alert import AlertSeverity, AlertStatus, AlertChannel
 from datetime import datetime, timedelta
-from sqlalchemy import desc
+from sqlalchemy import desc, select, update
 import json
 
 alerts_bp = Blueprint('alerts', __name__)
 
-def get_current_user_org():
-    """Get current user and organization"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user, user.organization if user else None
+# Value -> member lookups for parsing enums from request input
+_SEVERITY_MAP = {severity.value: severity for severity in AlertSeverity}
+_STATUS_MAP = {status.value: status for status in AlertStatus}
+
+# Alert rule fields that update_alert_rule copies straight from the request body
+_RULE_REQUIRED_FIELDS = ('name', 'rule_type')
+_RULE_OPTIONAL_FIELDS = (
+    'description', 'conditions', 'channels', 'recipients', 'cooldown_minutes',
+    'escalation_enabled', 'escalation_delay_minutes', 'escalation_recipients',
+    'is_active', 'pipeline_id', 'health_check_id'
+)
+
+# Columns serialized by the list endpoints. Selecting them directly skips ORM
+# object materialization (identity map, instance state) for every row on a page.
+_RULE_COLS = (
+    AlertRule.id, AlertRule.name, AlertRule.description, AlertRule.rule_type,
+    AlertRule.conditions, AlertRule.severity, AlertRule.channels, AlertRule.recipients,
+    AlertRule.cooldown_minutes, AlertRule.escalation_enabled, AlertRule.escalation_delay_minutes,
+    AlertRule.escalation_recipients, AlertRule.is_active, AlertRule.organization_id,
+    AlertRule.created_by, AlertRule.pipeline_id, AlertRule.health_check_id,
+    AlertRule.created_at, AlertRule.updated_at
+)
+
+_ALERT_COLS = (
+    Alert.id, Alert.alert_rule_id, Alert.title, Alert.message, Alert.severity, Alert.status,
+    Alert.context_data, Alert.source_type, Alert.source_id, Alert.organization_id,
+    Alert.created_by, Alert.pipeline_id, Alert.created_at, Alert.updated_at,
+    Alert.acknowledged_at, Alert.resolved_at, Alert.acknowledged_by, Alert.resolved_by
+)
+
+_HISTORY_COLS = (
+    AlertHistory.id, AlertHistory.alert_id, AlertHistory.action, AlertHistory.description,
+    AlertHistory.channel, AlertHistory.recipient, AlertHistory.sent_at, AlertHistory.success,
+    AlertHistory.error_message, AlertHistory.created_at, AlertHistory.created_by
+)
+
+def _rule_row_to_dict(row):
+    """Serialize a _RULE_COLS row the same way as AlertRule.to_dict()"""
+    rule = row._asdict()
+    rule['severity'] = row.severity.value
+    return rule
+
+def _alert_row_to_dict(row, now):
+    """Serialize an _ALERT_COLS row the same way as Alert.to_dict()"""
+    alert = row._asdict()
+    
+    if row.status == AlertStatus.RESOLVED and row.resolved_at:
+        ended_at = row.resolved_at
+    elif row.status == AlertStatus.ACKNOWLEDGED and row.acknowledged_at:
+        ended_at = row.acknowledged_at
+    else:
+        ended_at = now
+    
+    alert.update({
+        'severity': row.severity.value,
+        'status': row.status.value,
+        'is_active': row.status == AlertStatus.ACTIVE,
+        'is_acknowledged': row.status == AlertStatus.ACKNOWLEDGED,
+        'is_resolved': row.status == AlertStatus.RESOLVED,
+        'duration_minutes': (ended_at - row.created_at).total_seconds() / 60
+    })
+    return alert
+
+def _history_row_to_dict(row):
+    """Serialize a _HISTORY_COLS row the same way as AlertHistory.to_dict()"""
+    entry = row._asdict()
+    entry['channel'] = row.channel.value if row.channel else None
+    return entry
 
 @alerts_bp.route('/rules', methods=['GET'])
 @jwt_required()
 def get_alert_rules():
     """Get all alert rules for the organization"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Query parameters
     rule_type = request.args.get('type')
     is_active = request.args.get('is_active')
+    cursor = request.args.get('cursor')
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
-    # Build query
-    query = AlertRule.query.filter_by(organization_id=org.id)
+    # Rules change rarely, so serve repeated polls from the cache
+    cache_key = org_cache_key('alert_rules', org_id, rule_type, is_active, cursor, page, per_page)
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    # Build query as a Core select() so its compiled form is reused across requests
+    stmt = select(*_RULE_COLS).where(AlertRule.organization_id == org_id)
     
     if rule_type:
-        query = query.filter_by(rule_type=rule_type)
+        stmt = stmt.where(AlertRule.rule_type == rule_type)
     if is_active is not None:
-        query = query.filter_by(is_active=is_active.lower() == 'true')
+        stmt = stmt.where(AlertRule.is_active == (is_active.lower() == 'true'))
     
-    # Pagination
-    alert_rules = query.order_by(desc(AlertRule.created_at)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return jsonify({
-        'alert_rules': [rule.to_dict() for rule in alert_rules.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': alert_rules.total,
-            'pages': alert_rules.pages,
-            'has_next': alert_rules.has_next,
-            'has_prev': alert_rules.has_prev
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if cursor is not None:
+        try:
+            items, next_cursor = paginate_keyset(
+                stmt, AlertRule.created_at, AlertRule.id, cursor, per_page
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        result = {
+            'alert_rules': [_rule_row_to_dict(row) for row in items],
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
         }
-    }), 200
+    else:
+        # Page-based pagination
+        alert_rules, pagination = paginate_rows(
+            stmt.order_by(desc(AlertRule.created_at)), page, per_page
+        )
+        
+        result = {
+            'alert_rules': [_rule_row_to_dict(row) for row in alert_rules],
+            'pagination': pagination
+        }
+    
+    cache.set(cache_key, result)
+    return jsonify(result), 200
 
 @alerts_bp.route('/rules/<int:rule_id>', methods=['GET'])
 @jwt_required()
 def get_alert_rule(rule_id):
     """Get specific alert rule details"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     alert_rule = AlertRule.query.filter_by(
         id=rule_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not alert_rule:
@@ -76,8 +165,8 @@ def get_alert_rule(rule_id):
 @jwt_required()
 def create_alert_rule():
     """Create a new alert rule"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     data = request.get_json()
@@ -89,9 +178,8 @@ def create_alert_rule():
             return jsonify({'error': f'{field} is required'}), 400
     
     # Validate severity
-    try:
-        severity = AlertSeverity(data.get('severity', 'warning'))
-    except ValueError:
+    severity = parse_enum(_SEVERITY_MAP, data.get('severity', 'warning'))
+    if severity is None:
         return jsonify({'error': 'Invalid severity level'}), 400
     
     try:
@@ -108,14 +196,15 @@ def create_alert_rule():
             escalation_delay_minutes=data.get('escalation_delay_minutes', 30),
             escalation_recipients=data.get('escalation_recipients', []),
             is_active=data.get('is_active', True),
-            organization_id=org.id,
-            created_by=user.id,
+            organization_id=org_id,
+            created_by=get_jwt_identity(),
             pipeline_id=data.get('pipeline_id'),
             health_check_id=data.get('health_check_id')
         )
         
         db.session.add(alert_rule)
         db.session.commit()
+        invalidate_org_cache('alert_rules', org_id)
         
         return jsonify({
             'message': 'Alert rule created successfully',
@@ -130,13 +219,13 @@ def create_alert_rule():
 @jwt_required()
 def update_alert_rule(rule_id):
     """Update alert rule"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     alert_rule = AlertRule.query.filter_by(
         id=rule_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not alert_rule:
@@ -144,56 +233,24 @@ def update_alert_rule(rule_id):
     
     data = request.get_json()
     
-    # Update fields
-    if data.get('name'):
-        alert_rule.name = data['name']
-    
-    if data.get('description') is not None:
-        alert_rule.description = data['description']
-    
-    if data.get('rule_type'):
-        alert_rule.rule_type = data['rule_type']
+    # Required columns are only replaced by non-empty values
+    for field in _RULE_REQUIRED_FIELDS:
+        if data.get(field):
+            setattr(alert_rule, field, data[field])
     
-    if data.get('conditions') is not None:
-        alert_rule.conditions = data['conditions']
+    for field in _RULE_OPTIONAL_FIELDS:
+        if data.get(field) is not None:
+            setattr(alert_rule, field, data[field])
     
     if data.get('severity'):
-        try:
-            alert_rule.severity = AlertSeverity(data['severity'])
-        except ValueError:
+        severity = parse_enum(_SEVERITY_MAP, data['severity'])
+        if severity is None:
             return jsonify({'error': 'Invalid severity level'}), 400
-    
-    if data.get('channels') is not None:
-        alert_rule.channels = data['channels']
-    
-    if data.get('recipients') is not None:
-        alert_rule.recipients = data['recipients']
-    
-    if data.get('cooldown_minutes') is not None:
-        alert_rule.cooldown_minutes = data['cooldown_minutes']
-    
-    if data.get('escalation_enabled') is not None:
-        alert_rule.escalation_enabled = data['escalation_enabled']
-    
-    if data.get('escalation_delay_minutes') is not None:
-        alert_rule.escalation_delay_minutes = data['escalation_delay_minutes']
-    
-    if data.get('escalation_recipients') is not None:
-        alert_rule.escalation_recipients = data['escalation_recipients']
-    
-    if data.get('is_active') is not None:
-        alert_rule.is_active = data['is_active']
-    
-    if data.get('pipeline_id') is not None:
-        alert_rule.pipeline_id = data['pipeline_id']
-    
-    if data.get('health_check_id') is not None:
-        alert_rule.health_check_id = data['health_check_id']
-    
-    alert_rule.updated_at = datetime.utcnow()
+        alert_rule.severity = severity
     
     try:
         db.session.commit()
+        invalidate_org_cache('alert_rules', org_id)
         return jsonify({
             'message': 'Alert rule updated successfully',
             'alert_rule': alert_rule.to_dict()
@@ -207,13 +264,13 @@ def update_alert_rule(rule_id):
 @jwt_required()
 def delete_alert_rule(rule_id):
     """Delete alert rule"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     alert_rule = AlertRule.query.filter_by(
         id=rule_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not alert_rule:
@@ -222,6 +279,7 @@ def delete_alert_rule(rule_id):
     try:
         db.session.delete(alert_rule)
         db.session.commit()
+        invalidate_org_cache('alert_rules', org_id)
         
         return jsonify({'message': 'Alert rule deleted successfully'}), 200
         
@@ -233,8 +291,8 @@ def delete_alert_rule(rule_id):
 @jwt_required()
 def get_alerts():
     """Get all alerts for the organization"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Query parameters
@@ -245,43 +303,60 @@ def get_alerts():
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
     # Build query
-    query = Alert.query.filter_by(organization_id=org.id)
+    stmt = select(*_ALERT_COLS).where(Alert.organization_id == org_id)
     
     if status:
-        query = query.filter_by(status=AlertStatus(status))
+        status_enum = parse_enum(_STATUS_MAP, status)
+        if status_enum is None:
+            return jsonify({'error': 'Invalid status'}), 400
+        stmt = stmt.where(Alert.status == status_enum)
     if severity:
-        query = query.filter_by(severity=AlertSeverity(severity))
+        severity_enum = parse_enum(_SEVERITY_MAP, severity)
+        if severity_enum is None:
+            return jsonify({'error': 'Invalid severity level'}), 400
+        stmt = stmt.where(Alert.severity == severity_enum)
     if source_type:
-        query = query.filter_by(source_type=source_type)
+        stmt = stmt.where(Alert.source_type == source_type)
     
-    # Pagination
-    alerts = query.order_by(desc(Alert.created_at)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = paginate_keyset(
+                stmt, Alert.created_at, Alert.id, request.args['cursor'], per_page
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        now = datetime.utcnow()
+        return jsonify({
+            'alerts': [_alert_row_to_dict(row, now) for row in items],
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
+        }), 200
     
+    # Page-based pagination
+    alerts, pagination = paginate_rows(stmt.order_by(desc(Alert.created_at)), page, per_page)
+    
+    now = datetime.utcnow()
     return jsonify({
-        'alerts': [alert.to_dict() for alert in alerts.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': alerts.total,
-            'pages': alerts.pages,
-            'has_next': alerts.has_next,
-            'has_prev': alerts.has_prev
-        }
+        'alerts': [_alert_row_to_dict(row, now) for row in alerts],
+        'pagination': pagination
     }), 200
 
 @alerts_bp.route('/<int:alert_id>', methods=['GET'])
 @jwt_required()
 def get_alert(alert_id):
     """Get specific alert details"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     alert = Alert.query.filter_by(
         id=alert_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not alert:
@@ -289,36 +364,56 @@ def get_alert(alert_id):
     
     return jsonify({'alert': alert.to_dict()}), 200
 
+def _transition_alert(alert_id, identity, status, action, values):
+    """Move an alert to a new status with one conditional UPDATE plus a history row.
+    
+    Returns the updated alert, or None when it doesn't exist or already has that status.
+    """
+    alert = db.session.execute(
+        update(Alert)
+        .where(Alert.id == alert_id, Alert.organization_id == identity.org_id, Alert.status != status)
+        .values(status=status, **values)
+        .returning(Alert)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    
+    if alert:
+        # Core UPDATEs skip mapper events, so mark the dashboard's alert counts stale here
+        mark_org_cache_stale(db.session, 'dashboard', identity.org_id)
+        db.session.add(AlertHistory(
+            alert_id=alert_id,
+            action=action,
+            description=f'Alert {action} by {identity.username}',
+            created_by=identity.user_id
+        ))
+    return alert
+
+def _alert_exists(alert_id, org_id):
+    return db.session.execute(
+        select(Alert.id).where(Alert.id == alert_id, Alert.organization_id == org_id)
+    ).first() is not None
+
 @alerts_bp.route('/<int:alert_id>/acknowledge', methods=['POST'])
 @jwt_required()
 def acknowledge_alert(alert_id):
     """Acknowledge an alert"""
-    user, org = get_current_user_org()
-    if not org:
+    # The cached identity supplies the username for the history entry without loading the user
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
-    alert = Alert.query.filter_by(
-        id=alert_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not alert:
-        return jsonify({'error': 'Alert not found'}), 404
-    
-    if alert.is_acknowledged():
-        return jsonify({'error': 'Alert is already acknowledged'}), 400
-    
     try:
-        alert.acknowledge(user.id)
+        now = datetime.utcnow()
+        alert = _transition_alert(alert_id, identity, AlertStatus.ACKNOWLEDGED, 'acknowledged', {
+            'acknowledged_at': now,
+            'acknowledged_by': identity.user_id
+        })
         
-        # Create history entry
-        history = AlertHistory(
-            alert_id=alert_id,
-            action='acknowledged',
-            description=f'Alert acknowledged by {user.username}',
-            created_by=user.id
-        )
-        db.session.add(history)
+        if not alert:
+            db.session.rollback()
+            if not _alert_exists(alert_id, identity.org_id):
+                return jsonify({'error': 'Alert not found'}), 404
+            return jsonify({'error': 'Alert is already acknowledged'}), 400
         
         db.session.commit()
         
@@ -335,32 +430,23 @@ def acknowledge_alert(alert_id):
 @jwt_required()
 def resolve_alert(alert_id):
     """Resolve an alert"""
-    user, org = get_current_user_org()
-    if not org:
+    # The cached identity supplies the username for the history entry without loading the user
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
-    alert = Alert.query.filter_by(
-        id=alert_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not alert:
-        return jsonify({'error': 'Alert not found'}), 404
-    
-    if alert.is_resolved():
-        return jsonify({'error': 'Alert is already resolved'}), 400
-    
     try:
-        alert.resolve(user.id)
+        now = datetime.utcnow()
+        alert = _transition_alert(alert_id, identity, AlertStatus.RESOLVED, 'resolved', {
+            'resolved_at': now,
+            'resolved_by': identity.user_id
+        })
         
-        # Create history entry
-        history = AlertHistory(
-            alert_id=alert_id,
-            action='resolved',
-            description=f'Alert resolved by {user.username}',
-            created_by=user.id
-        )
-        db.session.add(history)
+        if not alert:
+            db.session.rollback()
+            if not _alert_exists(alert_id, identity.org_id):
+                return jsonify({'error': 'Alert not found'}), 404
+            return jsonify({'error': 'Alert is already resolved'}), 400
         
         db.session.commit()
         
@@ -377,22 +463,32 @@ def resolve_alert(alert_id):
 @jwt_required()
 def get_alert_history(alert_id):
     """Get alert history"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     alert = Alert.query.filter_by(
         id=alert_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not alert:
         return jsonify({'error': 'Alert not found'}), 404
     
-    history = AlertHistory.query.filter_by(alert_id=alert_id).order_by(
-        desc(AlertHistory.created_at)
-    ).all()
+    stmt = (
+        select(*_HISTORY_COLS)
+        .where(AlertHistory.alert_id == alert_id)
+        .order_by(desc(AlertHistory.created_at))
+        .execution_options(yield_per=500)
+    )
+    
+    # Stream entries as they are fetched instead of building the whole list first
+    def generate():
+        yield b'{"history":['
+        separator = b''
+        for row in db.session.execute(stmt):
+            yield separator + current_app.json.dumpb(_history_row_to_dict(row))
+            separator = b','
+        yield b']}'
     
-    return jsonify({
-        'history': [entry.to_dict() for entry in history]
-    }), 200 
\ No newline at end of file
+    return Response(stream_with_context(generate()), mimetype='application/json'), 200 
\ No newline at end of file
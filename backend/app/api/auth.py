@@ -1,28 +1,43 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
-from app import db, bcrypt
-from app.models import User, Role, Organization, OrganizationSettings
+from app import db, cache
+from app.api.utils import (
+    ROLES_CACHE_KEY, get_role_id, insert_role, load_user_with_org, mark_org_cache_stale, org_cache_key,
+    token_claims
+)
+from app.models import User, Organization, OrganizationSettings
 from app.models.user import RoleEnum
 from app.models.organization import SubscriptionTier
 from datetime import datetime
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import selectinload
 import re
 
 auth_bp = Blueprint('auth', __name__)
 
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_STRONG_PASSWORD_RE = re.compile(r'^(?=.*[A-Z])(?=.*[a-z])(?=.*\d).{8,}$', re.DOTALL)
+_UPPER_RE = re.compile(r'[A-Z]')
+_LOWER_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def validate_password(password):
     """Validate password strength"""
+    # Single pass for the common valid case; individual checks only to pick the error message
+    if _STRONG_PASSWORD_RE.match(password):
+        return True, "Password is valid"
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
-    if not re.search(r'[A-Z]', password):
+    if not _UPPER_RE.search(password):
         return False, "Password must contain at least one uppercase letter"
-    if not re.search(r'[a-z]', password):
+    if not _LOWER_RE.search(password):
         return False, "Password must contain at least one lowercase letter"
-    if not re.search(r'\d', password):
+    if not _DIGIT_RE.search(password):
         return False, "Password must contain at least one number"
     return True, "Password is valid"
 
@@ -46,13 +61,23 @@ def register():
     if not is_valid:
         return jsonify({'error': message}), 400
     
-    # Check if user already exists
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 409
-    
-    if User.query.filter_by(username=data['username']).first():
+    # Check if user already exists (email and username in one round trip)
+    existing = db.session.execute(
+        select(User.email, User.username)
+        .where(or_(User.email == data['email'], User.username == data['username']))
+        .order_by((User.email == data['email']).desc())
+        .limit(1)
+    ).first()
+    if existing:
+        if existing.email == data['email']:
+            return jsonify({'error': 'Email already registered'}), 409
         return jsonify({'error': 'Username already taken'}), 409
     
+    # End the read transaction so bcrypt doesn't run while holding a pooled connection,
+    # and duplicate registrations never pay for a hash
+    db.session.rollback()
+    password_hash = User.hash_password(data['password'])
+    
     try:
         # Create organization
         organization = Organization(
@@ -60,44 +85,40 @@ def register():
             slug=data['organization_name'].lower().replace(' ', '-'),
             subscription_tier=SubscriptionTier.STARTER
         )
-        db.session.add(organization)
-        db.session.flush()  # Get the organization ID
         
         # Create organization settings
-        org_settings = OrganizationSettings(
-            organization_id=organization.id
-        )
-        db.session.add(org_settings)
+        org_settings = OrganizationSettings(organization=organization)
         
-        # Get or create default roles
-        admin_role = Role.query.filter_by(name=RoleEnum.ADMIN.value).first()
-        if not admin_role:
-            admin_role = Role(
-                name=RoleEnum.ADMIN.value,
-                description='Administrator with full access',
-                permissions=['*']  # All permissions
-            )
-            db.session.add(admin_role)
-            db.session.flush()
-        
-        # Create user
+        # Create user, linked through relationships so the unit of work resolves
+        # foreign keys and inserts everything in a single flush at commit
         user = User(
             email=data['email'],
             username=data['username'],
             first_name=data['first_name'],
             last_name=data['last_name'],
-            organization_id=organization.id,
-            role_id=admin_role.id,
-            is_verified=True  # Auto-verify for now
+            organization=organization,
+            is_verified=True,  # Auto-verify for now
+            password_hash=password_hash
         )
-        user.password = data['password']
         
-        db.session.add(user)
+        # Get or create default roles
+        admin_role_id = get_role_id(RoleEnum.ADMIN.value)
+        if admin_role_id is None:
+            user.role_id = insert_role(
+                RoleEnum.ADMIN.value, 'Administrator with full access', ['*']  # All permissions
+            )
+        else:
+            user.role_id = admin_role_id
+        
+        db.session.add_all([organization, org_settings, user])
         db.session.commit()
+        if admin_role_id is None:
+            cache.delete(ROLES_CACHE_KEY)
         
         # Create tokens
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        claims = token_claims(user)
+        access_token = create_access_token(identity=user.id, additional_claims=claims)
+        refresh_token = create_refresh_token(identity=user.id, additional_claims=claims)
         
         return jsonify({
             'message': 'Registration successful',
@@ -119,36 +140,64 @@ def login():
     if not data.get('email') or not data.get('password'):
         return jsonify({'error': 'Email and password are required'}), 400
     
-    user = User.query.filter_by(email=data['email']).first()
+    # Fetch only the credentials and end the read transaction, so the pooled connection
+    # isn't held while bcrypt runs and failed attempts never load the full user
+    credentials = db.session.execute(
+        select(User.id, User.password_hash, User.is_active).filter_by(email=data['email'])
+    ).first()
+    db.session.rollback()
     
-    if not user or not user.verify_password(data['password']):
+    if not credentials or not User.check_password(credentials.password_hash, data['password']):
         return jsonify({'error': 'Invalid email or password'}), 401
     
-    if not user.is_active:
+    if not credentials.is_active:
         return jsonify({'error': 'Account is deactivated'}), 401
     
-    # Update last login
-    user.last_login = datetime.utcnow()
+    # Update last login and load the user back in one UPDATE ... RETURNING
+    user = db.session.execute(
+        update(User)
+        .where(User.id == credentials.id)
+        .values(last_login=datetime.utcnow())
+        .returning(User)
+        .options(selectinload(User.organization), selectinload(User.role))
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    
+    # Core UPDATEs skip mapper events. last_login shows in the user listings and in this
+    # user's own profile, so drop just that profile rather than every profile in the org
+    mark_org_cache_stale(db.session, 'users', user.organization_id)
+    user_data = user.to_dict()
+    organization_data = user.organization.to_dict()
+    claims = token_claims(user)
     db.session.commit()
+    cache.delete(org_cache_key('profile', user.organization_id, user.id))
     
     # Create tokens
-    access_token = create_access_token(identity=user.id)
-    refresh_token = create_refresh_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims=claims)
+    refresh_token = create_refresh_token(identity=user.id, additional_claims=claims)
     
     return jsonify({
         'message': 'Login successful',
         'access_token': access_token,
         'refresh_token': refresh_token,
-        'user': user.to_dict(),
-        'organization': user.organization.to_dict()
+        'user': user_data,
+        'organization': organization_data
     }), 200
 
 @auth_bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
     """Refresh access token"""
-    current_user_id = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user_id)
+    # Re-check the user on every refresh so deleted or deactivated accounts stop getting
+    # access tokens, and rebuild the claims from the current row
+    user = db.session.execute(
+        select(User.organization_id, User.is_active).where(User.id == get_jwt_identity())
+    ).first()
+    
+    if not user or not user.is_active:
+        return jsonify({'error': 'User not found or deactivated'}), 401
+    
+    new_access_token = create_access_token(identity=get_jwt_identity(), additional_claims=token_claims(user))
     
     return jsonify({
         'access_token': new_access_token
@@ -159,7 +208,7 @@ def refresh():
 def get_current_user():
     """Get current user information"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_user_with_org(current_user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -173,14 +222,22 @@ def get_current_user():
 @jwt_required()
 def update_current_user():
     """Update current user information"""
+    data = request.get_json()
+    
+    # Validate and hash before loading the user so bcrypt doesn't run inside the open transaction
+    password_hash = None
+    if data.get('password'):
+        is_valid, message = validate_password(data['password'])
+        if not is_valid:
+            return jsonify({'error': message}), 400
+        password_hash = User.hash_password(data['password'])
+    
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_user_with_org(current_user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    data = request.get_json()
-    
     # Update allowed fields
     if data.get('first_name'):
         user.first_name = data['first_name']
@@ -188,19 +245,16 @@ def update_current_user():
         user.last_name = data['last_name']
     if data.get('username'):
         # Check if username is already taken
-        existing_user = User.query.filter_by(username=data['username']).first()
-        if existing_user and existing_user.id != user.id:
+        username_taken = db.session.execute(
+            select(User.id).where(User.username == data['username'], User.id != user.id).limit(1)
+        ).first()
+        if username_taken:
             return jsonify({'error': 'Username already taken'}), 409
         user.username = data['username']
     
-    # Update password if provided
-    if data.get('password'):
-        is_valid, message = validate_password(data['password'])
-        if not is_valid:
-            return jsonify({'error': message}), 400
-        user.password = data['password']
+    if password_hash:
+        user.password_hash = password_hash
     
-    user.updated_at = datetime.utcnow()
     db.session.commit()
     
     return jsonify({
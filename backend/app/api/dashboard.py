@@ -1,162 +1,225 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from flask_jwt_extended import jwt_required
+from app import db, cache
+from app.api.alerts import _ALERT_COLS, _alert_row_to_dict
+from app.api.utils import (
+    get_current_org_id, get_days_arg, mark_org_cache_stale, org_cache_key, raiseload_options, run_concurrently
+)
 from app.models import (
     Pipeline, PipelineRun, PipelineMetric, 
     DataSource, HealthCheck, HealthCheckResult,
-    Alert, AlertRule, User, Organization
+    Alert, AlertRule, Organization,
+    PipelineDailyStats, HealthCheckDailyStats, AlertDailyStats
 )
-from app.models.pipeline import PipelineStatus, RunStatus
+from app.models.pipeline import UPTIME_WINDOW_DAYS, PipelineStatus, RunStatus
 from app.models.monitoring import HealthCheckStatus
-from app.models.alert import AlertStatus, AlertSeverity
+from app.models.alert import AlertStatus
 from datetime import datetime, timedelta
-from sqlalchemy import func, desc, and_
+from functools import partial
+from sqlalchemy import event, func, desc, and_, lambda_stmt, literal, select, true, tuple_, union_all
+from sqlalchemy.orm import aliased, load_only, object_session
+import base64
 import json
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-def get_current_user_org():
-    """Get current user and organization"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user, user.organization if user else None
+# Cache timeouts (seconds): overview carries live alert counts, the rest are daily aggregates.
+# Metrics and top pipelines read the rollups, which only change when refresh_daily_rollups runs,
+# so they live under their own 'rollups' namespace that new rows don't invalidate and simply
+# expire on the refresh cadence
+OVERVIEW_CACHE_TIMEOUT = 60
+AGGREGATE_CACHE_TIMEOUT = 300
+
+# Number of entries returned by the recent activity feed
+RECENT_ACTIVITY_LIMIT = 20
+
+@event.listens_for(PipelineRun, 'after_insert')
+@event.listens_for(HealthCheckResult, 'after_insert')
+@event.listens_for(Alert, 'after_insert')
+def _mark_dashboard_stale(mapper, connection, target):
+    """Invalidate the organization's cached live dashboards once the new row is committed"""
+    mark_org_cache_stale(object_session(target), 'dashboard', target.organization_id)
+
+def _org_counts(model, org_id, active_condition):
+    """Subquery counting an organization's rows of a model, total and active"""
+    name = model.__tablename__
+    return select(
+        func.count().label(f'{name}_total'),
+        func.count().filter(active_condition).label(f'{name}_active')
+    ).where(model.organization_id == org_id).subquery()
 
 @dashboard_bp.route('/overview', methods=['GET'])
 @jwt_required()
 def get_dashboard_overview():
     """Get dashboard overview data"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Get date range (default to last 30 days)
-    days = int(request.args.get('days', 30))
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    days = get_days_arg()
     
-    # Pipeline statistics
-    total_pipelines = Pipeline.query.filter_by(organization_id=org.id).count()
-    active_pipelines = Pipeline.query.filter_by(
-        organization_id=org.id, 
-        status=PipelineStatus.ACTIVE
-    ).count()
-    
-    # Get pipeline runs in date range
-    recent_runs = PipelineRun.query.join(Pipeline).filter(
-        Pipeline.organization_id == org.id,
-        PipelineRun.started_at >= cutoff_date
-    ).all()
+    # Serve recently computed aggregates from the cache
+    cache_key = org_cache_key('dashboard', org_id, 'overview', days)
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
     
-    successful_runs = [run for run in recent_runs if run.status == RunStatus.SUCCESS]
-    failed_runs = [run for run in recent_runs if run.status == RunStatus.FAILED]
+    # Pipeline runs in date range, counted per status
+    run_counts = select(
+        func.count().label('runs_recent'),
+        func.count().filter(PipelineRun.status == RunStatus.SUCCESS).label('runs_successful'),
+        func.count().filter(PipelineRun.status == RunStatus.FAILED).label('runs_failed')
+    ).where(PipelineRun.organization_id == org_id, PipelineRun.started_at >= cutoff_date).subquery()
+    
+    # Recent health check results, counted per status
+    result_counts = select(
+        func.count().filter(HealthCheckResult.status == HealthCheckStatus.HEALTHY).label('results_healthy'),
+        func.count().filter(HealthCheckResult.status == HealthCheckStatus.WARNING).label('results_warning'),
+        func.count().filter(HealthCheckResult.status == HealthCheckStatus.CRITICAL).label('results_critical')
+    ).where(HealthCheckResult.organization_id == org_id, HealthCheckResult.checked_at >= cutoff_date).subquery()
+    
+    # Entity totals plus the run and result counts above, all in one round trip
+    aggregates = [
+        _org_counts(Pipeline, org_id, Pipeline.status == PipelineStatus.ACTIVE),
+        _org_counts(DataSource, org_id, DataSource.is_active.is_(True)),
+        _org_counts(HealthCheck, org_id, HealthCheck.is_active.is_(True)),
+        _org_counts(Alert, org_id, Alert.status == AlertStatus.ACTIVE),
+        run_counts,
+        result_counts
+    ]
+    counts_stmt = select(*[column for subquery in aggregates for column in subquery.c])
+    counts_stmt = counts_stmt.select_from(aggregates[0])
+    for subquery in aggregates[1:]:
+        counts_stmt = counts_stmt.join(subquery, true())
+    
+    # The counts and the newest alerts are independent, so fetch them concurrently
+    def load_counts():
+        return dict(db.session.execute(counts_stmt).one()._mapping)
+    
+    def load_recent_alerts():
+        rows = db.session.execute(
+            select(*_ALERT_COLS).where(Alert.organization_id == org_id)
+            .order_by(desc(Alert.created_at)).limit(5)
+        ).all()
+        now = datetime.utcnow()
+        return [_alert_row_to_dict(row, now) for row in rows]
+    
+    counts, recent_alerts = run_concurrently(load_counts, load_recent_alerts)
+    
+    recent_runs = counts['runs_recent']
+    successful_runs = counts['runs_successful']
+    failed_runs = counts['runs_failed']
     
     # Calculate uptime percentage
     uptime_percentage = 0
     if recent_runs:
-        uptime_percentage = (len(successful_runs) / len(recent_runs)) * 100
-    
-    # Data source statistics
-    total_data_sources = DataSource.query.filter_by(organization_id=org.id).count()
-    active_data_sources = DataSource.query.filter_by(
-        organization_id=org.id, 
-        is_active=True
-    ).count()
-    
-    # Health check statistics
-    total_health_checks = HealthCheck.query.filter_by(organization_id=org.id).count()
-    active_health_checks = HealthCheck.query.filter_by(
-        organization_id=org.id, 
-        is_active=True
-    ).count()
-    
-    # Get recent health check results
-    recent_health_results = HealthCheckResult.query.join(HealthCheck).filter(
-        HealthCheck.organization_id == org.id,
-        HealthCheckResult.checked_at >= cutoff_date
-    ).all()
-    
-    healthy_checks = [result for result in recent_health_results if result.status == HealthCheckStatus.HEALTHY]
-    warning_checks = [result for result in recent_health_results if result.status == HealthCheckStatus.WARNING]
-    critical_checks = [result for result in recent_health_results if result.status == HealthCheckStatus.CRITICAL]
+        uptime_percentage = (successful_runs / recent_runs) * 100
     
-    # Alert statistics
-    total_alerts = Alert.query.filter_by(organization_id=org.id).count()
-    active_alerts = Alert.query.filter_by(
-        organization_id=org.id, 
-        status=AlertStatus.ACTIVE
-    ).count()
-    
-    # Recent alerts
-    recent_alerts = Alert.query.filter_by(organization_id=org.id).order_by(
-        desc(Alert.created_at)
-    ).limit(5).all()
-    
-    return jsonify({
+    result = {
         'overview': {
             'pipelines': {
-                'total': total_pipelines,
-                'active': active_pipelines,
+                'total': counts['pipelines_total'],
+                'active': counts['pipelines_active'],
                 'uptime_percentage': round(uptime_percentage, 2),
-                'recent_runs': len(recent_runs),
-                'successful_runs': len(successful_runs),
-                'failed_runs': len(failed_runs)
+                'recent_runs': recent_runs,
+                'successful_runs': successful_runs,
+                'failed_runs': failed_runs
             },
             'data_sources': {
-                'total': total_data_sources,
-                'active': active_data_sources
+                'total': counts['data_sources_total'],
+                'active': counts['data_sources_active']
             },
             'health_checks': {
-                'total': total_health_checks,
-                'active': active_health_checks,
-                'healthy': len(healthy_checks),
-                'warnings': len(warning_checks),
-                'critical': len(critical_checks)
+                'total': counts['health_checks_total'],
+                'active': counts['health_checks_active'],
+                'healthy': counts['results_healthy'],
+                'warnings': counts['results_warning'],
+                'critical': counts['results_critical']
             },
             'alerts': {
-                'total': total_alerts,
-                'active': active_alerts,
-                'recent_alerts': [alert.to_dict() for alert in recent_alerts]
+                'total': counts['alerts_total'],
+                'active': counts['alerts_active'],
+                'recent_alerts': recent_alerts
             }
         }
-    }), 200
+    }
+    cache.set(cache_key, result, timeout=OVERVIEW_CACHE_TIMEOUT)
+    return jsonify(result), 200
 
 @dashboard_bp.route('/pipeline-health', methods=['GET'])
 @jwt_required()
 def get_pipeline_health():
     """Get pipeline health summary"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    # Get all pipelines with their health status
-    pipelines = Pipeline.query.filter_by(organization_id=org.id).all()
+    # Latest run per pipeline, ranked newest first within each pipeline
+    ranked_runs = select(
+        PipelineRun,
+        func.row_number().over(
+            partition_by=PipelineRun.pipeline_id,
+            order_by=(PipelineRun.started_at.desc(), PipelineRun.id.desc())
+        ).label('run_rank')
+    ).where(PipelineRun.organization_id == org_id).subquery()
+    latest_run = aliased(PipelineRun, ranked_runs)
+    
+    # Run counts per pipeline over the uptime window
+    uptime_cutoff = datetime.utcnow() - timedelta(days=UPTIME_WINDOW_DAYS)
+    run_counts = select(
+        PipelineRun.pipeline_id,
+        func.count().label('total_runs'),
+        func.count().filter(PipelineRun.status == RunStatus.SUCCESS).label('successful_runs')
+    ).where(
+        PipelineRun.organization_id == org_id,
+        PipelineRun.started_at >= uptime_cutoff
+    ).group_by(PipelineRun.pipeline_id).subquery()
+    
+    # Get all pipelines with their latest run and uptime counts in one query
+    rows = db.session.execute(
+        select(Pipeline, latest_run, run_counts.c.total_runs, run_counts.c.successful_runs)
+        .outerjoin(latest_run, and_(latest_run.pipeline_id == Pipeline.id, ranked_runs.c.run_rank == 1))
+        .outerjoin(run_counts, run_counts.c.pipeline_id == Pipeline.id)
+        .where(Pipeline.organization_id == org_id)
+        .order_by(Pipeline.id)
+        .options(load_only(
+            Pipeline.id, Pipeline.name, Pipeline.pipeline_type, Pipeline.status,
+            Pipeline.freshness_threshold_hours
+        ))
+    ).all()
     
     pipeline_health = []
-    for pipeline in pipelines:
-        latest_run = pipeline.get_latest_run()
-        uptime = pipeline.get_uptime_percentage()
+    healthy_count = 0
+    for pipeline, run, total_runs, successful_runs in rows:
+        uptime = (successful_runs / total_runs) * 100 if total_runs else 0.0
+        is_healthy = pipeline.is_healthy_for_run(run)
+        if is_healthy:
+            healthy_count += 1
         
         pipeline_health.append({
             'id': pipeline.id,
             'name': pipeline.name,
             'type': pipeline.pipeline_type.value,
             'status': pipeline.status.value,
-            'is_healthy': pipeline.is_healthy(),
+            'is_healthy': is_healthy,
             'uptime_percentage': uptime,
-            'last_run': latest_run.to_dict() if latest_run else None,
-            'health_status': 'healthy' if pipeline.is_healthy() else 'unhealthy'
+            'last_run': run.to_dict() if run else None,
+            'health_status': 'healthy' if is_healthy else 'unhealthy'
         })
     
-    # Calculate summary statistics
-    healthy_pipelines = [p for p in pipeline_health if p['is_healthy']]
-    unhealthy_pipelines = [p for p in pipeline_health if not p['is_healthy']]
+    # Summary statistics, counted while building the rows
+    total = len(pipeline_health)
     
     return jsonify({
         'pipelines': pipeline_health,
         'summary': {
-            'total': len(pipelines),
-            'healthy': len(healthy_pipelines),
-            'unhealthy': len(unhealthy_pipelines),
-            'health_percentage': round((len(healthy_pipelines) / len(pipelines)) * 100, 2) if pipelines else 0
+            'total': total,
+            'healthy': healthy_count,
+            'unhealthy': total - healthy_count,
+            'health_percentage': round((healthy_count / total) * 100, 2) if total else 0
         }
     }), 200
 
@@ -164,244 +227,363 @@ def get_pipeline_health():
 @jwt_required()
 def get_data_source_health():
     """Get data source health summary"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    # Get all data sources with their health status
-    data_sources = DataSource.query.filter_by(organization_id=org.id).all()
+    # Latest health check result per data source, ranked newest first
+    ranked_results = select(
+        HealthCheckResult,
+        HealthCheck.data_source_id,
+        func.row_number().over(
+            partition_by=HealthCheck.data_source_id,
+            order_by=(HealthCheckResult.checked_at.desc(), HealthCheckResult.id.desc())
+        ).label('result_rank')
+    ).join(HealthCheck).where(HealthCheck.organization_id == org_id).subquery()
+    latest_result = aliased(HealthCheckResult, ranked_results)
+    
+    # Get all data sources with their latest result in one query
+    rows = db.session.execute(
+        select(DataSource, latest_result)
+        .outerjoin(latest_result, and_(
+            ranked_results.c.data_source_id == DataSource.id,
+            ranked_results.c.result_rank == 1
+        ))
+        .where(DataSource.organization_id == org_id)
+        .order_by(DataSource.id)
+        .options(load_only(
+            DataSource.id, DataSource.name, DataSource.source_type, DataSource.is_active,
+            DataSource.last_checked_at
+        ))
+    ).all()
     
     data_source_health = []
-    for ds in data_sources:
-        latest_check = ds.get_latest_health_check()
+    healthy_count = 0
+    for ds, latest_check in rows:
+        is_healthy = latest_check is not None and latest_check.status == HealthCheckStatus.HEALTHY
+        if is_healthy:
+            healthy_count += 1
         
         data_source_health.append({
             'id': ds.id,
             'name': ds.name,
             'type': ds.source_type.value,
             'is_active': ds.is_active,
-            'is_healthy': ds.is_healthy(),
-            'last_checked': ds.last_checked_at.isoformat() if ds.last_checked_at else None,
+            'is_healthy': is_healthy,
+            'last_checked': ds.last_checked_at,
             'latest_check': latest_check.to_dict() if latest_check else None,
-            'health_status': 'healthy' if ds.is_healthy() else 'unhealthy'
+            'health_status': 'healthy' if is_healthy else 'unhealthy'
         })
     
-    # Calculate summary statistics
-    healthy_sources = [ds for ds in data_source_health if ds['is_healthy']]
-    unhealthy_sources = [ds for ds in data_source_health if not ds['is_healthy']]
+    # Summary statistics, counted while building the rows
+    total = len(data_source_health)
     
     return jsonify({
         'data_sources': data_source_health,
         'summary': {
-            'total': len(data_sources),
-            'healthy': len(healthy_sources),
-            'unhealthy': len(unhealthy_sources),
-            'health_percentage': round((len(healthy_sources) / len(data_sources)) * 100, 2) if data_sources else 0
+            'total': total,
+            'healthy': healthy_count,
+            'unhealthy': total - healthy_count,
+            'health_percentage': round((healthy_count / total) * 100, 2) if total else 0
         }
     }), 200
 
-@dashboard_bp.route('/recent-activity', methods=['GET'])
-@jwt_required()
-def get_recent_activity():
-    """Get recent activity across all systems"""
-    user, org = get_current_user_org()
-    if not org:
-        return jsonify({'error': 'Organization not found'}), 404
-    
-    # Get recent pipeline runs
-    recent_runs = PipelineRun.query.join(Pipeline).filter(
-        Pipeline.organization_id == org.id
-    ).order_by(desc(PipelineRun.started_at)).limit(10).all()
-    
-    # Get recent health check results
-    recent_health_results = HealthCheckResult.query.join(HealthCheck).filter(
-        HealthCheck.organization_id == org.id
-    ).order_by(desc(HealthCheckResult.checked_at)).limit(10).all()
-    
-    # Get recent alerts
-    recent_alerts = Alert.query.filter_by(organization_id=org.id).order_by(
-        desc(Alert.created_at)
-    ).limit(10).all()
-    
-    # Combine and sort activities
-    activities = []
+def _pipeline_run_activities(run_ids):
+    """Activity entries for the given runs, keyed by run id"""
+    # Select just the pipeline name rather than hydrating a Pipeline per run
+    rows = db.session.execute(
+        select(PipelineRun, Pipeline.name).join(Pipeline)
+        .where(PipelineRun.id.in_(run_ids))
+        .options(*raiseload_options(PipelineRun))
+    ).all()
     
-    for run in recent_runs:
-        activities.append({
+    activities = {}
+    for run, pipeline_name in rows:
+        status = run.status.value
+        activities[run.id] = {
             'type': 'pipeline_run',
             'timestamp': run.started_at,
-            'title': f"Pipeline '{run.pipeline.name}' {run.status.value}",
-            'description': f"Pipeline run {run.status.value}",
-            'status': run.status.value,
+            'title': f"Pipeline '{pipeline_name}' {status}",
+            'description': f"Pipeline run {status}",
+            'status': status,
             'data': run.to_dict()
-        })
+        }
+    return activities
+
+def _health_check_activities(result_ids):
+    """Activity entries for the given health check results, keyed by result id"""
+    # Select just the check name rather than hydrating a HealthCheck per result
+    rows = db.session.execute(
+        select(HealthCheckResult, HealthCheck.name).join(HealthCheck)
+        .where(HealthCheckResult.id.in_(result_ids))
+        .options(*raiseload_options(HealthCheckResult))
+    ).all()
     
-    for result in recent_health_results:
-        activities.append({
+    activities = {}
+    for result, check_name in rows:
+        status = result.status.value
+        activities[result.id] = {
             'type': 'health_check',
             'timestamp': result.checked_at,
-            'title': f"Health check '{result.health_check.name}' {result.status.value}",
-            'description': result.message or f"Health check {result.status.value}",
-            'status': result.status.value,
+            'title': f"Health check '{check_name}' {status}",
+            'description': result.message or f"Health check {status}",
+            'status': status,
             'data': result.to_dict()
-        })
-    
-    for alert in recent_alerts:
-        activities.append({
+        }
+    return activities
+
+def _alert_activities(alert_ids):
+    """Activity entries for the given alerts, keyed by alert id"""
+    # Plain column rows, serialized without building Alert instances
+    rows = db.session.execute(select(*_ALERT_COLS).where(Alert.id.in_(alert_ids))).all()
+    now = datetime.utcnow()
+    
+    activities = {}
+    for row in rows:
+        alert = _alert_row_to_dict(row, now)
+        activities[row.id] = {
             'type': 'alert',
-            'timestamp': alert.created_at,
-            'title': f"Alert: {alert.title}",
-            'description': alert.message,
-            'status': alert.status.value,
-            'severity': alert.severity.value,
-            'data': alert.to_dict()
-        })
+            'timestamp': row.created_at,
+            'title': f"Alert: {row.title}",
+            'description': row.message,
+            'status': alert['status'],
+            'severity': alert['severity'],
+            'data': alert
+        }
+    return activities
+
+def _encode_activity_cursor(activity_type, activity_id, timestamp):
+    """Encode a (timestamp, type, id) activity feed position as an opaque cursor string"""
+    payload = json.dumps([timestamp.isoformat(), activity_type, activity_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+def _decode_activity_cursor(cursor):
+    """Decode a cursor produced by _encode_activity_cursor, raising ValueError if malformed"""
+    try:
+        timestamp, activity_type, activity_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), str(activity_type), int(activity_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def _after_activity_cursor(cursor, activity_type, timestamp_column, id_column):
+    """Predicate for one union branch: rows ranked after the cursor in (timestamp, type, id) DESC order"""
+    timestamp, cursor_type, cursor_id = cursor
+    # The type is constant within a branch, so it only decides how timestamp ties break
+    if activity_type < cursor_type:
+        return timestamp_column <= timestamp
+    if activity_type > cursor_type:
+        return timestamp_column < timestamp
+    return tuple_(timestamp_column, id_column) < (timestamp, cursor_id)
+
+@dashboard_bp.route('/recent-activity', methods=['GET'])
+@jwt_required()
+def get_recent_activity():
+    """Get recent activity across all systems"""
+    org_id = get_current_org_id()
+    if not org_id:
+        return jsonify({'error': 'Organization not found'}), 404
     
-    # Sort by timestamp (most recent first)
-    activities.sort(key=lambda x: x['timestamp'], reverse=True)
+    # Optional keyset cursor: only return activity after this (timestamp, type, id) position
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor = _decode_activity_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    
+    # Pick the most recent activity across runs, results and alerts in one query; each
+    # branch walks its (organization_id, timestamp) index newest first
+    branches = []
+    for activity_type, model, timestamp_column in (
+        ('pipeline_run', PipelineRun, PipelineRun.started_at),
+        ('health_check', HealthCheckResult, HealthCheckResult.checked_at),
+        ('alert', Alert, Alert.created_at)
+    ):
+        branch = select(
+            literal(activity_type).label('type'), model.id.label('id'), timestamp_column.label('timestamp')
+        ).where(model.organization_id == org_id)
+        if cursor:
+            branch = branch.where(_after_activity_cursor(cursor, activity_type, timestamp_column, model.id))
+        branches.append(branch)
+    recent = union_all(*branches).order_by(desc('timestamp'), desc('type'), desc('id')).limit(RECENT_ACTIVITY_LIMIT)
+    recent_rows = db.session.execute(recent).all()
+    
+    ids_by_type = {}
+    for activity_type, activity_id, _ in recent_rows:
+        ids_by_type.setdefault(activity_type, []).append(activity_id)
+    
+    # Load and render the chosen rows, one query per type, concurrently
+    loaders = {
+        'pipeline_run': _pipeline_run_activities,
+        'health_check': _health_check_activities,
+        'alert': _alert_activities
+    }
+    types = list(ids_by_type)
+    loaded = run_concurrently(*[partial(loaders[t], ids_by_type[t]) for t in types])
+    activities_by_type = dict(zip(types, loaded))
+    
+    # Keep the order the query ranked them (most recent first), skipping rows deleted
+    # between the two queries
+    activities = [
+        activities_by_type[activity_type][activity_id]
+        for activity_type, activity_id, _ in recent_rows
+        if activity_id in activities_by_type[activity_type]
+    ]
+    
+    # A full page may have older entries; the cursor points past the last ranked row
+    next_cursor = None
+    if len(recent_rows) == RECENT_ACTIVITY_LIMIT:
+        next_cursor = _encode_activity_cursor(*recent_rows[-1])
     
     return jsonify({
-        'activities': activities[:20]  # Return top 20 most recent activities
+        'activities': activities,
+        'next_cursor': next_cursor
     }), 200
 
 @dashboard_bp.route('/metrics', methods=['GET'])
 @jwt_required()
 def get_dashboard_metrics():
     """Get aggregated metrics for dashboard charts"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Get date range
-    days = int(request.args.get('days', 30))
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    days = get_days_arg()
+    
+    # Serve recently computed aggregates from the cache
+    cache_key = org_cache_key('rollups', org_id, 'metrics', days)
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    # Read pre-aggregated daily buckets maintained by the refresh_daily_rollups task
+    cutoff_date = (datetime.utcnow() - timedelta(days=days)).date()
+    
+    # lambda_stmt caches each statement's construction and compiled SQL by code location,
+    # so repeat polls only rebind org_id and cutoff_date
     
     # Pipeline run metrics over time
-    pipeline_metrics = db.session.query(
-        func.date(PipelineRun.started_at).label('date'),
-        func.count(PipelineRun.id).label('total_runs'),
-        func.sum(case((PipelineRun.status == RunStatus.SUCCESS, 1), else_=0)).label('successful_runs'),
-        func.sum(case((PipelineRun.status == RunStatus.FAILED, 1), else_=0)).label('failed_runs')
-    ).join(Pipeline).filter(
-        Pipeline.organization_id == org.id,
-        PipelineRun.started_at >= cutoff_date
-    ).group_by(func.date(PipelineRun.started_at)).order_by(func.date(PipelineRun.started_at)).all()
+    pipeline_metrics = db.session.execute(lambda_stmt(lambda: select(
+        PipelineDailyStats.date,
+        func.sum(PipelineDailyStats.total_runs).label('total_runs'),
+        func.sum(PipelineDailyStats.successful_runs).label('successful_runs'),
+        func.sum(PipelineDailyStats.failed_runs).label('failed_runs'),
+        func.coalesce(func.round(
+            func.sum(PipelineDailyStats.successful_runs) * 100.0
+            / func.nullif(func.sum(PipelineDailyStats.total_runs), 0), 2
+        ), 0).label('success_rate')
+    ).where(
+        PipelineDailyStats.organization_id == org_id,
+        PipelineDailyStats.date >= cutoff_date
+    ).group_by(PipelineDailyStats.date).order_by(PipelineDailyStats.date))).mappings().all()
     
     # Health check metrics over time
-    health_metrics = db.session.query(
-        func.date(HealthCheckResult.checked_at).label('date'),
-        func.count(HealthCheckResult.id).label('total_checks'),
-        func.sum(case((HealthCheckResult.status == HealthCheckStatus.HEALTHY, 1), else_=0)).label('healthy_checks'),
-        func.sum(case((HealthCheckResult.status == HealthCheckStatus.WARNING, 1), else_=0)).label('warning_checks'),
-        func.sum(case((HealthCheckResult.status == HealthCheckStatus.CRITICAL, 1), else_=0)).label('critical_checks')
-    ).join(HealthCheck).filter(
-        HealthCheck.organization_id == org.id,
-        HealthCheckResult.checked_at >= cutoff_date
-    ).group_by(func.date(HealthCheckResult.checked_at)).order_by(func.date(HealthCheckResult.checked_at)).all()
+    health_metrics = db.session.execute(lambda_stmt(lambda: select(
+        HealthCheckDailyStats.date,
+        func.sum(HealthCheckDailyStats.total_checks).label('total_checks'),
+        func.sum(HealthCheckDailyStats.healthy_checks).label('healthy_checks'),
+        func.sum(HealthCheckDailyStats.warning_checks).label('warning_checks'),
+        func.sum(HealthCheckDailyStats.critical_checks).label('critical_checks'),
+        func.coalesce(func.round(
+            func.sum(HealthCheckDailyStats.healthy_checks) * 100.0
+            / func.nullif(func.sum(HealthCheckDailyStats.total_checks), 0), 2
+        ), 0).label('health_rate')
+    ).where(
+        HealthCheckDailyStats.organization_id == org_id,
+        HealthCheckDailyStats.date >= cutoff_date
+    ).group_by(HealthCheckDailyStats.date).order_by(HealthCheckDailyStats.date))).mappings().all()
     
     # Alert metrics over time
-    alert_metrics = db.session.query(
-        func.date(Alert.created_at).label('date'),
-        func.count(Alert.id).label('total_alerts'),
-        func.sum(case((Alert.severity == AlertSeverity.CRITICAL, 1), else_=0)).label('critical_alerts'),
-        func.sum(case((Alert.severity == AlertSeverity.WARNING, 1), else_=0)).label('warning_alerts')
-    ).filter(
-        Alert.organization_id == org.id,
-        Alert.created_at >= cutoff_date
-    ).group_by(func.date(Alert.created_at)).order_by(func.date(Alert.created_at)).all()
-    
-    return jsonify({
-        'pipeline_metrics': [
-            {
-                'date': str(m.date),
-                'total_runs': m.total_runs,
-                'successful_runs': m.successful_runs,
-                'failed_runs': m.failed_runs,
-                'success_rate': round((m.successful_runs / m.total_runs) * 100, 2) if m.total_runs > 0 else 0
-            }
-            for m in pipeline_metrics
-        ],
-        'health_metrics': [
-            {
-                'date': str(m.date),
-                'total_checks': m.total_checks,
-                'healthy_checks': m.healthy_checks,
-                'warning_checks': m.warning_checks,
-                'critical_checks': m.critical_checks,
-                'health_rate': round((m.healthy_checks / m.total_checks) * 100, 2) if m.total_checks > 0 else 0
-            }
-            for m in health_metrics
-        ],
-        'alert_metrics': [
-            {
-                'date': str(m.date),
-                'total_alerts': m.total_alerts,
-                'critical_alerts': m.critical_alerts,
-                'warning_alerts': m.warning_alerts
-            }
-            for m in alert_metrics
-        ]
-    }), 200
+    alert_metrics = db.session.execute(lambda_stmt(lambda: select(
+        AlertDailyStats.date,
+        AlertDailyStats.total_alerts,
+        AlertDailyStats.critical_alerts,
+        AlertDailyStats.warning_alerts
+    ).where(
+        AlertDailyStats.organization_id == org_id,
+        AlertDailyStats.date >= cutoff_date
+    ).order_by(AlertDailyStats.date))).mappings().all()
+    
+    # Rows already carry their rates; only the date needs converting for JSON
+    result = {
+        'pipeline_metrics': [{**m, 'date': str(m['date'])} for m in pipeline_metrics],
+        'health_metrics': [{**m, 'date': str(m['date'])} for m in health_metrics],
+        'alert_metrics': [{**m, 'date': str(m['date'])} for m in alert_metrics]
+    }
+    cache.set(cache_key, result, timeout=AGGREGATE_CACHE_TIMEOUT)
+    return jsonify(result), 200
 
 @dashboard_bp.route('/top-pipelines', methods=['GET'])
 @jwt_required()
 def get_top_pipelines():
     """Get top performing and problematic pipelines"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Get date range
-    days = int(request.args.get('days', 30))
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    days = get_days_arg()
     
-    # Top performing pipelines (highest success rate)
-    top_performers = db.session.query(
+    # Serve recently computed aggregates from the cache
+    cache_key = org_cache_key('rollups', org_id, 'top-pipelines', days)
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    cutoff_date = (datetime.utcnow() - timedelta(days=days)).date()
+    
+    # Per-pipeline totals summed from the daily rollup; the cached lambda statement is
+    # extended with a different ordering for each ranking
+    ranked_pipelines = lambda_stmt(lambda: select(
         Pipeline,
-        func.count(PipelineRun.id).label('total_runs'),
-        func.sum(case((PipelineRun.status == RunStatus.SUCCESS, 1), else_=0)).label('successful_runs')
-    ).join(PipelineRun).filter(
-        Pipeline.organization_id == org.id,
-        PipelineRun.started_at >= cutoff_date
+        func.sum(PipelineDailyStats.total_runs).label('total_runs'),
+        func.sum(PipelineDailyStats.successful_runs).label('successful_runs'),
+        func.sum(PipelineDailyStats.failed_runs).label('failed_runs'),
+        # HAVING below guarantees a non-zero total
+        func.round(
+            func.sum(PipelineDailyStats.successful_runs) * 100.0 / func.sum(PipelineDailyStats.total_runs), 2
+        ).label('success_rate'),
+        func.round(
+            func.sum(PipelineDailyStats.failed_runs) * 100.0 / func.sum(PipelineDailyStats.total_runs), 2
+        ).label('failure_rate')
+    ).join(PipelineDailyStats, PipelineDailyStats.pipeline_id == Pipeline.id).where(
+        PipelineDailyStats.organization_id == org_id,
+        PipelineDailyStats.date >= cutoff_date
     ).group_by(Pipeline.id).having(
-        func.count(PipelineRun.id) >= 5  # At least 5 runs in the period
-    ).order_by(
-        func.sum(case((PipelineRun.status == RunStatus.SUCCESS, 1), else_=0)).desc()
-    ).limit(5).all()
+        func.sum(PipelineDailyStats.total_runs) >= 5  # At least 5 runs in the period
+    ))
+    
+    # Top performing pipelines (highest success rate)
+    top_performers = db.session.execute(ranked_pipelines + (
+        lambda s: s.order_by(func.sum(PipelineDailyStats.successful_runs).desc()).limit(5)
+    )).all()
     
     # Most problematic pipelines (highest failure rate)
-    problematic = db.session.query(
-        Pipeline,
-        func.count(PipelineRun.id).label('total_runs'),
-        func.sum(case((PipelineRun.status == RunStatus.FAILED, 1), else_=0)).label('failed_runs')
-    ).join(PipelineRun).filter(
-        Pipeline.organization_id == org.id,
-        PipelineRun.started_at >= cutoff_date
-    ).group_by(Pipeline.id).having(
-        func.count(PipelineRun.id) >= 5  # At least 5 runs in the period
-    ).order_by(
-        func.sum(case((PipelineRun.status == RunStatus.FAILED, 1), else_=0)).desc()
-    ).limit(5).all()
+    problematic = db.session.execute(ranked_pipelines + (
+        lambda s: s.order_by(func.sum(PipelineDailyStats.failed_runs).desc()).limit(5)
+    )).all()
     
-    return jsonify({
+    result = {
         'top_performers': [
             {
-                'pipeline': pipeline.to_dict(),
-                'total_runs': total_runs,
-                'successful_runs': successful_runs,
-                'success_rate': round((successful_runs / total_runs) * 100, 2)
+                'pipeline': row.Pipeline.to_dict(),
+                'total_runs': row.total_runs,
+                'successful_runs': row.successful_runs,
+                'success_rate': row.success_rate
             }
-            for pipeline, total_runs, successful_runs in top_performers
+            for row in top_performers
         ],
         'problematic': [
             {
-                'pipeline': pipeline.to_dict(),
-                'total_runs': total_runs,
-                'failed_runs': failed_runs,
-                'failure_rate': round((failed_runs / total_runs) * 100, 2)
+                'pipeline': row.Pipeline.to_dict(),
+                'total_runs': row.total_runs,
+                'failed_runs': row.failed_runs,
+                'failure_rate': row.failure_rate
             }
-            for pipeline, total_runs, failed_runs in problematic
+            for row in problematic
         ]
-    }), 200
-
-# Import the case function for SQLAlchemy 
\ No newline at end of file
+    }
+    cache.set(cache_key, result, timeout=AGGREGATE_CACHE_TIMEOUT)
+    return jsonify(result), 200
+ 
\ No newline at end of file
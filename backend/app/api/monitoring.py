@@ -1,26 +1,66 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models import DataSource, HealthCheck, HealthCheckResult, User, Organization
+from flask import Blueprint, request, jsonify, url_for
+from flask_jwt_extended import jwt_required
+from app import db, cache
+from app.api.utils import (
+    get_current_org_id, get_days_arg, insert_returning, is_unique_violation,
+    mark_org_cache_stale, org_cache_key, paginate_keyset, paginate_no_count, parse_enum,
+    private_cache, raiseload_options
+)
+from app.api.schemas import (
+    DataSourceCreate, DataSourceUpdate, HealthCheckCreate, validation_error
+)
+from app.models import DataSource, HealthCheck, HealthCheckResult, Organization
 from app.models.monitoring import DataSourceType, HealthCheckType, HealthCheckStatus
 from datetime import datetime, timedelta
-from sqlalchemy import desc
+from pydantic import ValidationError
+from sqlalchemy import desc, event, lambda_stmt, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session, selectinload
 import json
 
 monitoring_bp = Blueprint('monitoring', __name__)
 
-def get_current_user_org():
-    """Get current user and organization"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user, user.organization if user else None
+# Value -> member lookups for parsing enums from query parameters
+_SOURCE_TYPE_MAP = {source_type.value: source_type for source_type in DataSourceType}
+_CHECK_TYPE_MAP = {check_type.value: check_type for check_type in HealthCheckType}
+_CHECK_STATUS_MAP = {status.value: status for status in HealthCheckStatus}
+
+@event.listens_for(DataSource, 'after_insert')
+@event.listens_for(DataSource, 'after_update')
+@event.listens_for(DataSource, 'after_delete')
+def _mark_data_sources_stale(mapper, connection, target):
+    mark_org_cache_stale(object_session(target), 'data_sources', target.organization_id)
+
+@event.listens_for(HealthCheck, 'after_insert')
+@event.listens_for(HealthCheck, 'after_update')
+@event.listens_for(HealthCheck, 'after_delete')
+@event.listens_for(HealthCheckResult, 'after_insert')
+@event.listens_for(HealthCheckResult, 'after_update')
+def _mark_health_checks_stale(mapper, connection, target):
+    """Data source listings embed their checks' latest result, so invalidate both"""
+    session = object_session(target)
+    mark_org_cache_stale(session, 'health_checks', target.organization_id)
+    mark_org_cache_stale(session, 'data_sources', target.organization_id)
+
+# Ownership checks run on every nested route; lambda_stmt caches their construction
+# and compiled SQL by code location, so each call only rebinds the ids
+
+def _data_source_exists(data_source_id, org_id):
+    return db.session.execute(lambda_stmt(lambda: select(DataSource.id).where(
+        DataSource.id == data_source_id, DataSource.organization_id == org_id
+    ))).first() is not None
+
+def _health_check_exists(health_check_id, org_id):
+    return db.session.execute(lambda_stmt(lambda: select(HealthCheck.id).where(
+        HealthCheck.id == health_check_id, HealthCheck.organization_id == org_id
+    ))).first() is not None
 
 @monitoring_bp.route('/data-sources', methods=['GET'])
 @jwt_required()
 def get_data_sources():
     """Get all data sources for the organization"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Query parameters
@@ -29,42 +69,69 @@ def get_data_sources():
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
-    # Build query
-    query = DataSource.query.filter_by(organization_id=org.id)
+    # Lists are polled by the UI; serve repeats from the cache until a write invalidates them
+    cache_key = org_cache_key('data_sources', org_id, request.path, request.query_string.decode())
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    # Build query; batch-load the latest result to_dict() reads, one row per data source
+    query = DataSource.query.options(
+        selectinload(DataSource.latest_result), *raiseload_options(DataSource)
+    ).filter_by(organization_id=org_id)
     
     if source_type:
-        query = query.filter_by(source_type=DataSourceType(source_type))
+        source_type_enum = parse_enum(_SOURCE_TYPE_MAP, source_type)
+        if source_type_enum is None:
+            return jsonify({'error': 'Invalid source type'}), 400
+        query = query.filter_by(source_type=source_type_enum)
     if is_active is not None:
         query = query.filter_by(is_active=is_active.lower() == 'true')
     
-    # Pagination
-    data_sources = query.order_by(desc(DataSource.created_at)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return jsonify({
-        'data_sources': [ds.to_dict() for ds in data_sources.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': data_sources.total,
-            'pages': data_sources.pages,
-            'has_next': data_sources.has_next,
-            'has_prev': data_sources.has_prev
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = paginate_keyset(
+                query.statement, DataSource.created_at, DataSource.id, request.args['cursor'], per_page,
+                scalars=True
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        result = {
+            'data_sources': [ds.to_dict() for ds in items],
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
         }
-    }), 200
+    else:
+        # Page-based pagination; COUNT(*) only when the client asks for totals
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        data_sources, pagination = paginate_no_count(
+            query.order_by(desc(DataSource.created_at)), page, per_page, include_total
+        )
+        
+        result = {
+            'data_sources': [ds.to_dict() for ds in data_sources],
+            'pagination': pagination
+        }
+    
+    cache.set(cache_key, result)
+    return jsonify(result), 200
 
 @monitoring_bp.route('/data-sources/<int:data_source_id>', methods=['GET'])
 @jwt_required()
 def get_data_source(data_source_id):
     """Get specific data source details"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     data_source = DataSource.query.filter_by(
         id=data_source_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not data_source:
@@ -76,55 +143,37 @@ def get_data_source(data_source_id):
 @jwt_required()
 def create_data_source():
     """Create a new data source"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    data = request.get_json()
-    
-    # Validate required fields
-    required_fields = ['name', 'source_type', 'connection_config']
-    for field in required_fields:
-        if not data.get(field):
-            return jsonify({'error': f'{field} is required'}), 400
-    
-    # Validate source type
     try:
-        source_type = DataSourceType(data['source_type'])
-    except ValueError:
-        return jsonify({'error': 'Invalid source type'}), 400
-    
-    # Check if data source name already exists in organization
-    existing_ds = DataSource.query.filter_by(
-        name=data['name'],
-        organization_id=org.id
-    ).first()
-    
-    if existing_ds:
-        return jsonify({'error': 'Data source name already exists'}), 409
+        payload = DataSourceCreate.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify(validation_error(e)), 400
     
     try:
-        data_source = DataSource(
-            name=data['name'],
-            description=data.get('description'),
-            source_type=source_type,
-            connection_config=data['connection_config'],
-            credentials=data.get('credentials'),
-            is_active=data.get('is_active', True),
-            check_interval_seconds=data.get('check_interval_seconds', 300),
-            timeout_seconds=data.get('timeout_seconds', 30),
-            tags=data.get('tags', []),
-            organization_id=org.id
+        data_source = insert_returning(
+            DataSource,
+            **payload.model_dump(),
+            organization_id=org_id
         )
         
-        db.session.add(data_source)
+        # Serialize before the commit expires the instance, saving a refresh SELECT
+        data_source_data = data_source.to_dict()
         db.session.commit()
         
         return jsonify({
             'message': 'Data source created successfully',
-            'data_source': data_source.to_dict()
+            'data_source': data_source_data
         }), 201
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_unique_violation(e):
+            return jsonify({'error': 'Data source name already exists'}), 409
+        return jsonify({'error': 'Failed to create data source', 'details': str(e)}), 500
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to create data source', 'details': str(e)}), 500
@@ -133,67 +182,46 @@ def create_data_source():
 @jwt_required()
 def update_data_source(data_source_id):
     """Update data source"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    data_source = DataSource.query.filter_by(
-        id=data_source_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not data_source:
-        return jsonify({'error': 'Data source not found'}), 404
-    
-    data = request.get_json()
-    
-    # Update fields
-    if data.get('name'):
-        # Check if name already exists
-        existing_ds = DataSource.query.filter_by(
-            name=data['name'],
-            organization_id=org.id
-        ).first()
-        if existing_ds and existing_ds.id != data_source.id:
-            return jsonify({'error': 'Data source name already exists'}), 409
-        data_source.name = data['name']
-    
-    if data.get('description') is not None:
-        data_source.description = data['description']
-    
-    if data.get('source_type'):
-        try:
-            data_source.source_type = DataSourceType(data['source_type'])
-        except ValueError:
-            return jsonify({'error': 'Invalid source type'}), 400
-    
-    if data.get('connection_config') is not None:
-        data_source.connection_config = data['connection_config']
-    
-    if data.get('credentials') is not None:
-        data_source.credentials = data['credentials']
-    
-    if data.get('is_active') is not None:
-        data_source.is_active = data['is_active']
-    
-    if data.get('check_interval_seconds') is not None:
-        data_source.check_interval_seconds = data['check_interval_seconds']
-    
-    if data.get('timeout_seconds') is not None:
-        data_source.timeout_seconds = data['timeout_seconds']
-    
-    if data.get('tags') is not None:
-        data_source.tags = data['tags']
+    try:
+        payload = DataSourceUpdate.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify(validation_error(e)), 400
     
-    data_source.updated_at = datetime.utcnow()
+    values = payload.model_dump(exclude_unset=True)
     
     try:
+        # A single UPDATE ... RETURNING both scopes the change to the organization and applies it
+        data_source = db.session.execute(
+            update(DataSource)
+            .where(DataSource.id == data_source_id, DataSource.organization_id == org_id)
+            .values(**values)
+            .returning(DataSource)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        
+        if not data_source:
+            return jsonify({'error': 'Data source not found'}), 404
+        
+        # Core UPDATEs skip mapper events, so mark the listings stale here
+        mark_org_cache_stale(db.session, 'data_sources', org_id)
+        data_source_data = data_source.to_dict()
         db.session.commit()
+        
         return jsonify({
             'message': 'Data source updated successfully',
-            'data_source': data_source.to_dict()
+            'data_source': data_source_data
         }), 200
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_unique_violation(e):
+            return jsonify({'error': 'Data source name already exists'}), 409
+        return jsonify({'error': 'Failed to update data source', 'details': str(e)}), 500
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to update data source', 'details': str(e)}), 500
@@ -202,13 +230,13 @@ def update_data_source(data_source_id):
 @jwt_required()
 def delete_data_source(data_source_id):
     """Delete data source"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     data_source = DataSource.query.filter_by(
         id=data_source_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not data_source:
@@ -228,13 +256,13 @@ def delete_data_source(data_source_id):
 @jwt_required()
 def test_data_source_connection(data_source_id):
     """Test data source connection"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     data_source = DataSource.query.filter_by(
         id=data_source_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not data_source:
@@ -260,8 +288,8 @@ def test_data_source_connection(data_source_id):
 @jwt_required()
 def get_health_checks():
     """Get all health checks for the organization"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Query parameters
@@ -271,44 +299,71 @@ def get_health_checks():
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
-    # Build query
-    query = HealthCheck.query.filter_by(organization_id=org.id)
+    # Lists are polled by the UI; serve repeats from the cache until a write invalidates them
+    cache_key = org_cache_key('health_checks', org_id, request.path, request.query_string.decode())
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    # Build query; batch-load to_dict()'s latest result, one row per check, instead of one SELECT per check
+    query = HealthCheck.query.options(
+        selectinload(HealthCheck.latest_result), *raiseload_options(HealthCheck)
+    ).filter_by(organization_id=org_id)
     
     if check_type:
-        query = query.filter_by(check_type=HealthCheckType(check_type))
+        check_type_enum = parse_enum(_CHECK_TYPE_MAP, check_type)
+        if check_type_enum is None:
+            return jsonify({'error': 'Invalid check type'}), 400
+        query = query.filter_by(check_type=check_type_enum)
     if data_source_id:
         query = query.filter_by(data_source_id=data_source_id)
     if is_active is not None:
         query = query.filter_by(is_active=is_active.lower() == 'true')
     
-    # Pagination
-    health_checks = query.order_by(desc(HealthCheck.created_at)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return jsonify({
-        'health_checks': [hc.to_dict() for hc in health_checks.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': health_checks.total,
-            'pages': health_checks.pages,
-            'has_next': health_checks.has_next,
-            'has_prev': health_checks.has_prev
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = paginate_keyset(
+                query.statement, HealthCheck.created_at, HealthCheck.id, request.args['cursor'], per_page,
+                scalars=True
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        result = {
+            'health_checks': [hc.to_dict() for hc in items],
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
         }
-    }), 200
+    else:
+        # Page-based pagination; COUNT(*) only when the client asks for totals
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        health_checks, pagination = paginate_no_count(
+            query.order_by(desc(HealthCheck.created_at)), page, per_page, include_total
+        )
+        
+        result = {
+            'health_checks': [hc.to_dict() for hc in health_checks],
+            'pagination': pagination
+        }
+    
+    cache.set(cache_key, result)
+    return jsonify(result), 200
 
 @monitoring_bp.route('/health-checks/<int:health_check_id>', methods=['GET'])
 @jwt_required()
 def get_health_check(health_check_id):
     """Get specific health check details"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     health_check = HealthCheck.query.filter_by(
         id=health_check_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not health_check:
@@ -320,55 +375,32 @@ def get_health_check(health_check_id):
 @jwt_required()
 def create_health_check():
     """Create a new health check"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    data = request.get_json()
-    
-    # Validate required fields
-    required_fields = ['name', 'check_type', 'config', 'data_source_id']
-    for field in required_fields:
-        if not data.get(field):
-            return jsonify({'error': f'{field} is required'}), 400
-    
-    # Validate check type
     try:
-        check_type = HealthCheckType(data['check_type'])
-    except ValueError:
-        return jsonify({'error': 'Invalid check type'}), 400
+        payload = HealthCheckCreate.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify(validation_error(e)), 400
     
     # Verify data source exists and belongs to organization
-    data_source = DataSource.query.filter_by(
-        id=data['data_source_id'],
-        organization_id=org.id
-    ).first()
-    
-    if not data_source:
+    if not _data_source_exists(payload.data_source_id, org_id):
         return jsonify({'error': 'Data source not found'}), 404
     
     try:
-        health_check = HealthCheck(
-            name=data['name'],
-            description=data.get('description'),
-            check_type=check_type,
-            config=data['config'],
-            is_active=data.get('is_active', True),
-            check_interval_seconds=data.get('check_interval_seconds', 300),
-            warning_threshold=data.get('warning_threshold'),
-            critical_threshold=data.get('critical_threshold'),
-            alert_on_warning=data.get('alert_on_warning', True),
-            alert_on_critical=data.get('alert_on_critical', True),
-            data_source_id=data['data_source_id'],
-            organization_id=org.id
+        health_check = insert_returning(
+            HealthCheck,
+            **payload.model_dump(),
+            organization_id=org_id
         )
         
-        db.session.add(health_check)
+        health_check_data = health_check.to_dict()
         db.session.commit()
         
         return jsonify({
             'message': 'Health check created successfully',
-            'health_check': health_check.to_dict()
+            'health_check': health_check_data
         }), 201
         
     except Exception as e:
@@ -377,64 +409,99 @@ def create_health_check():
 
 @monitoring_bp.route('/health-checks/<int:health_check_id>/results', methods=['GET'])
 @jwt_required()
+@private_cache(max_age=15)
 def get_health_check_results(health_check_id):
     """Get health check results"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    health_check = HealthCheck.query.filter_by(
-        id=health_check_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not health_check:
-        return jsonify({'error': 'Health check not found'}), 404
-    
     # Query parameters
     status = request.args.get('status')
-    days = int(request.args.get('days', 30))
+    days = get_days_arg()
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 50)), 200)
     
-    # Build query
-    query = HealthCheckResult.query.filter_by(health_check_id=health_check_id)
+    # Build query; results carry organization_id, so ownership is checked in the same query
+    # and the health check lookup below only runs when a page comes back empty
+    query = HealthCheckResult.query.filter_by(health_check_id=health_check_id, organization_id=org_id)
     
     if status:
-        query = query.filter_by(status=HealthCheckStatus(status))
+        status_enum = parse_enum(_CHECK_STATUS_MAP, status)
+        if status_enum is None:
+            return jsonify({'error': 'Invalid status'}), 400
+        query = query.filter_by(status=status_enum)
     
     # Filter by date range
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     query = query.filter(HealthCheckResult.checked_at >= cutoff_date)
     
-    # Pagination
-    results = query.order_by(desc(HealthCheckResult.checked_at)).paginate(
-        page=page, per_page=per_page, error_out=False
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = paginate_keyset(
+                query.statement, HealthCheckResult.checked_at, HealthCheckResult.id, request.args['cursor'], per_page,
+                scalars=True
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        if not items and not _health_check_exists(health_check_id, org_id):
+            return jsonify({'error': 'Health check not found'}), 404
+        
+        return jsonify({
+            'results': [result.to_dict() for result in items],
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
+        }), 200
+    
+    # Page-based pagination; COUNT(*) only when the client asks for totals
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    results, pagination = paginate_no_count(
+        query.order_by(desc(HealthCheckResult.checked_at)), page, per_page, include_total
     )
     
+    if not results and not _health_check_exists(health_check_id, org_id):
+        return jsonify({'error': 'Health check not found'}), 404
+    
     return jsonify({
-        'results': [result.to_dict() for result in results.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': results.total,
-            'pages': results.pages,
-            'has_next': results.has_next,
-            'has_prev': results.has_prev
-        }
+        'results': [result.to_dict() for result in results],
+        'pagination': pagination
     }), 200
 
+@monitoring_bp.route('/health-checks/<int:health_check_id>/results/<int:result_id>', methods=['GET'])
+@jwt_required()
+def get_health_check_result(health_check_id, result_id):
+    """Get specific health check result"""
+    org_id = get_current_org_id()
+    if not org_id:
+        return jsonify({'error': 'Organization not found'}), 404
+    
+    result = HealthCheckResult.query.filter_by(
+        id=result_id,
+        health_check_id=health_check_id,
+        organization_id=org_id
+    ).first()
+    
+    if not result:
+        return jsonify({'error': 'Health check result not found'}), 404
+    
+    return jsonify({'result': result.to_dict()}), 200
+
 @monitoring_bp.route('/health-checks/<int:health_check_id>/run', methods=['POST'])
 @jwt_required()
 def run_health_check(health_check_id):
     """Manually run a health check"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    health_check = HealthCheck.query.filter_by(
-        id=health_check_id, 
-        organization_id=org.id
+    # Only the active flag is needed, not the whole health check row
+    health_check = db.session.execute(
+        select(HealthCheck.is_active).where(HealthCheck.id == health_check_id, HealthCheck.organization_id == org_id)
     ).first()
     
     if not health_check:
@@ -444,28 +511,30 @@ def run_health_check(health_check_id):
         return jsonify({'error': 'Health check is not active'}), 400
     
     try:
-        # TODO: Implement actual health check execution
-        # This would involve running the specific health check logic
-        # based on the check type and configuration
-        
-        # For now, create a mock result
-        result = HealthCheckResult(
+        # Record a pending result (UNKNOWN, no duration yet) for the worker to fill in
+        result = insert_returning(
+            HealthCheckResult,
             health_check_id=health_check_id,
-            status=HealthCheckStatus.HEALTHY,
-            duration_seconds=1.5,
-            metric_value=100.0,
-            metric_unit='records',
-            message='Health check completed successfully',
-            details={'tested_at': datetime.utcnow().isoformat()}
+            organization_id=org_id,
+            status=HealthCheckStatus.UNKNOWN,
+            message='Health check queued'
         )
         
-        db.session.add(result)
+        result_data = result.to_dict()
         db.session.commit()
         
+        # Execute on a Celery worker; imported here since app.tasks needs the app's celery instance
+        from app.tasks import execute_health_check
+        execute_health_check.delay(result_data['id'])
+        
+        status_url = url_for(
+            'monitoring.get_health_check_result', health_check_id=health_check_id, result_id=result_data['id']
+        )
         return jsonify({
-            'message': 'Health check executed successfully',
-            'result': result.to_dict()
-        }), 200
+            'message': 'Health check queued',
+            'result': result_data,
+            'status_url': status_url
+        }), 202, {'Location': status_url}
         
     except Exception as e:
         db.session.rollback()
@@ -1,26 +1,85 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models import Pipeline, PipelineRun, PipelineMetric, User, Organization
+from app import db, cache
+from app.api.utils import (
+    cache_stream, get_current_org_id, get_days_arg, insert_returning, is_unique_violation,
+    keyset_cursor, keyset_select, mark_org_cache_stale, org_cache_key, page_pagination,
+    paginate_keyset, paginate_no_count, parse_enum, private_cache, raiseload_options, stream_json_page
+)
+from app.api.schemas import PipelineCreate, PipelineUpdate, validation_error
+from app.models import Pipeline, PipelineRun, PipelineMetric, Organization
+from app.models.organization import PIPELINE_LIMITS, DEFAULT_PIPELINE_LIMIT
 from app.models.pipeline import PipelineType, PipelineStatus, RunStatus
 from datetime import datetime, timedelta
-from sqlalchemy import desc
+from itertools import chain
+from pydantic import ValidationError
+from sqlalchemy import case, desc, event, lambda_stmt, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session, selectinload
 import json
 
 pipelines_bp = Blueprint('pipelines', __name__)
 
-def get_current_user_org():
-    """Get current user and organization"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user, user.organization if user else None
+# Value -> member lookups for parsing enums from query parameters
+_PIPELINE_STATUS_MAP = {status.value: status for status in PipelineStatus}
+_PIPELINE_TYPE_MAP = {pipeline_type.value: pipeline_type for pipeline_type in PipelineType}
+_RUN_STATUS_MAP = {status.value: status for status in RunStatus}
+
+@event.listens_for(Pipeline, 'after_insert')
+@event.listens_for(Pipeline, 'after_update')
+@event.listens_for(Pipeline, 'after_delete')
+@event.listens_for(PipelineRun, 'after_insert')
+@event.listens_for(PipelineRun, 'after_update')
+@event.listens_for(PipelineMetric, 'after_insert')
+def _mark_pipelines_stale(mapper, connection, target):
+    """Pipeline listings embed the latest run and uptime, so runs invalidate them too"""
+    mark_org_cache_stale(object_session(target), 'pipelines', target.organization_id)
+
+def _reserve_pipeline_slot(org_id):
+    """Count a new pipeline against the organization's limit, returning False if it's reached.
+    
+    Check and increment are one conditional UPDATE, so concurrent creates can't overshoot.
+    """
+    limit = case(
+        *[(Organization.subscription_tier == tier, tier_limit) for tier, tier_limit in PIPELINE_LIMITS.items()],
+        else_=DEFAULT_PIPELINE_LIMIT
+    )
+    return db.session.execute(
+        update(Organization)
+        .where(Organization.id == org_id, or_(limit < 0, Organization.pipeline_count < limit))
+        .values(pipeline_count=Organization.pipeline_count + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount > 0
+
+def _pipeline_exists(pipeline_id, org_id):
+    # Runs on every nested route; lambda_stmt caches construction and compiled SQL by code location
+    return db.session.execute(lambda_stmt(lambda: select(Pipeline.id).where(
+        Pipeline.id == pipeline_id, Pipeline.organization_id == org_id
+    ))).first() is not None
+
+def _pipelines_to_dicts(pipelines):
+    """Serialize a page of pipelines, computing their uptime in one grouped query"""
+    uptimes = Pipeline.uptime_percentages([pipeline.id for pipeline in pipelines])
+    return [pipeline.to_dict(uptime_percentage=uptimes.get(pipeline.id, 0.0)) for pipeline in pipelines]
+
+# Columns for metric listings, selected as rows to skip ORM hydration on large pages.
+# The metadata_ attribute is labelled so the row keys match PipelineMetric.to_dict()
+_METRIC_COLS = (
+    PipelineMetric.id, PipelineMetric.pipeline_id, PipelineMetric.metric_name,
+    PipelineMetric.metric_value, PipelineMetric.metric_unit, PipelineMetric.run_id,
+    PipelineMetric.recorded_at, PipelineMetric.metadata_.label('metadata')
+)
+
+def _metric_row_to_dict(row):
+    """Serialize a _METRIC_COLS row the same way as PipelineMetric.to_dict()"""
+    return row._asdict()
 
 @pipelines_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_pipelines():
     """Get all pipelines for the organization"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Query parameters
@@ -29,42 +88,72 @@ def get_pipelines():
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
-    # Build query
-    query = Pipeline.query.filter_by(organization_id=org.id)
+    # Lists are polled by the UI; serve repeats from the cache until a write invalidates them
+    cache_key = org_cache_key('pipelines', org_id, request.path, request.query_string.decode())
+    result = cache.get(cache_key)
+    if result is not None:
+        return jsonify(result), 200
+    
+    # Build query; batch-load to_dict()'s latest run rather than a SELECT per pipeline
+    query = Pipeline.query.options(
+        selectinload(Pipeline.latest_run), *raiseload_options(Pipeline)
+    ).filter_by(organization_id=org_id)
     
     if status:
-        query = query.filter_by(status=PipelineStatus(status))
+        status_enum = parse_enum(_PIPELINE_STATUS_MAP, status)
+        if status_enum is None:
+            return jsonify({'error': 'Invalid status'}), 400
+        query = query.filter_by(status=status_enum)
     if pipeline_type:
-        query = query.filter_by(pipeline_type=PipelineType(pipeline_type))
-    
-    # Pagination
-    pipelines = query.order_by(desc(Pipeline.created_at)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+        pipeline_type_enum = parse_enum(_PIPELINE_TYPE_MAP, pipeline_type)
+        if pipeline_type_enum is None:
+            return jsonify({'error': 'Invalid pipeline type'}), 400
+        query = query.filter_by(pipeline_type=pipeline_type_enum)
     
-    return jsonify({
-        'pipelines': [pipeline.to_dict() for pipeline in pipelines.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': pipelines.total,
-            'pages': pipelines.pages,
-            'has_next': pipelines.has_next,
-            'has_prev': pipelines.has_prev
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = paginate_keyset(
+                query.statement, Pipeline.created_at, Pipeline.id, request.args['cursor'], per_page,
+                scalars=True
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        result = {
+            'pipelines': _pipelines_to_dicts(items),
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
         }
-    }), 200
+    else:
+        # Page-based pagination; COUNT(*) only when the client asks for totals
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        pipelines, pagination = paginate_no_count(
+            query.order_by(desc(Pipeline.created_at)), page, per_page, include_total
+        )
+        
+        result = {
+            'pipelines': _pipelines_to_dicts(pipelines),
+            'pagination': pagination
+        }
+    
+    cache.set(cache_key, result)
+    return jsonify(result), 200
 
 @pipelines_bp.route('/<int:pipeline_id>', methods=['GET'])
 @jwt_required()
 def get_pipeline(pipeline_id):
     """Get specific pipeline details"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     pipeline = Pipeline.query.filter_by(
         id=pipeline_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not pipeline:
@@ -76,69 +165,50 @@ def get_pipeline(pipeline_id):
 @jwt_required()
 def create_pipeline():
     """Create a new pipeline"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    # Check pipeline limit
-    if not org.can_add_pipeline():
-        return jsonify({
-            'error': f'Pipeline limit reached ({org.get_pipeline_limit()} pipelines)'
-        }), 403
-    
-    data = request.get_json()
-    
-    # Validate required fields
-    required_fields = ['name', 'pipeline_type']
-    for field in required_fields:
-        if not data.get(field):
-            return jsonify({'error': f'{field} is required'}), 400
-    
-    # Validate pipeline type
     try:
-        pipeline_type = PipelineType(data['pipeline_type'])
-    except ValueError:
-        return jsonify({'error': 'Invalid pipeline type'}), 400
-    
-    # Check if pipeline name already exists in organization
-    existing_pipeline = Pipeline.query.filter_by(
-        name=data['name'],
-        organization_id=org.id
-    ).first()
-    
-    if existing_pipeline:
-        return jsonify({'error': 'Pipeline name already exists'}), 409
+        payload = PipelineCreate.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify(validation_error(e)), 400
     
     try:
-        pipeline = Pipeline(
-            name=data['name'],
-            description=data.get('description'),
-            pipeline_type=pipeline_type,
+        # Check pipeline limit
+        if not _reserve_pipeline_slot(org_id):
+            db.session.rollback()
+            org = db.session.get(Organization, org_id)
+            if not org:
+                return jsonify({'error': 'Organization not found'}), 404
+            return jsonify({
+                'error': f'Pipeline limit reached ({org.get_pipeline_limit()} pipelines)'
+            }), 403
+        
+        pipeline = insert_returning(
+            Pipeline,
+            **payload.model_dump(),
             status=PipelineStatus.ACTIVE,
-            config=data.get('config', {}),
-            schedule=data.get('schedule'),
-            timeout_minutes=data.get('timeout_minutes', 60),
-            retry_attempts=data.get('retry_attempts', 3),
-            retry_delay_minutes=data.get('retry_delay_minutes', 5),
-            health_check_enabled=data.get('health_check_enabled', True),
-            freshness_threshold_hours=data.get('freshness_threshold_hours', 24),
-            volume_threshold_percent=data.get('volume_threshold_percent', 10.0),
-            auto_heal_enabled=data.get('auto_heal_enabled', False),
-            heal_script=data.get('heal_script'),
-            tags=data.get('tags', []),
-            organization_id=org.id,
-            created_by=user.id,
-            data_source_id=data.get('data_source_id')
+            organization_id=org_id,
+            created_by=get_jwt_identity()
         )
         
-        db.session.add(pipeline)
+        # Serialize before the commit expires the instance, saving a refresh SELECT;
+        # a new pipeline has no runs, so skip the uptime query
+        pipeline_data = pipeline.to_dict(uptime_percentage=0.0)
         db.session.commit()
         
         return jsonify({
             'message': 'Pipeline created successfully',
-            'pipeline': pipeline.to_dict()
+            'pipeline': pipeline_data
         }), 201
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_unique_violation(e):
+            return jsonify({'error': 'Pipeline name already exists'}), 409
+        return jsonify({'error': 'Failed to create pipeline', 'details': str(e)}), 500
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to create pipeline', 'details': str(e)}), 500
@@ -147,91 +217,46 @@ def create_pipeline():
 @jwt_required()
 def update_pipeline(pipeline_id):
     """Update pipeline"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    pipeline = Pipeline.query.filter_by(
-        id=pipeline_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not pipeline:
-        return jsonify({'error': 'Pipeline not found'}), 404
-    
-    data = request.get_json()
-    
-    # Update fields
-    if data.get('name'):
-        # Check if name already exists
-        existing_pipeline = Pipeline.query.filter_by(
-            name=data['name'],
-            organization_id=org.id
-        ).first()
-        if existing_pipeline and existing_pipeline.id != pipeline.id:
-            return jsonify({'error': 'Pipeline name already exists'}), 409
-        pipeline.name = data['name']
-    
-    if data.get('description') is not None:
-        pipeline.description = data['description']
-    
-    if data.get('pipeline_type'):
-        try:
-            pipeline.pipeline_type = PipelineType(data['pipeline_type'])
-        except ValueError:
-            return jsonify({'error': 'Invalid pipeline type'}), 400
-    
-    if data.get('status'):
-        try:
-            pipeline.status = PipelineStatus(data['status'])
-        except ValueError:
-            return jsonify({'error': 'Invalid status'}), 400
-    
-    if data.get('config') is not None:
-        pipeline.config = data['config']
-    
-    if data.get('schedule') is not None:
-        pipeline.schedule = data['schedule']
-    
-    if data.get('timeout_minutes') is not None:
-        pipeline.timeout_minutes = data['timeout_minutes']
-    
-    if data.get('retry_attempts') is not None:
-        pipeline.retry_attempts = data['retry_attempts']
-    
-    if data.get('retry_delay_minutes') is not None:
-        pipeline.retry_delay_minutes = data['retry_delay_minutes']
-    
-    if data.get('health_check_enabled') is not None:
-        pipeline.health_check_enabled = data['health_check_enabled']
-    
-    if data.get('freshness_threshold_hours') is not None:
-        pipeline.freshness_threshold_hours = data['freshness_threshold_hours']
-    
-    if data.get('volume_threshold_percent') is not None:
-        pipeline.volume_threshold_percent = data['volume_threshold_percent']
-    
-    if data.get('auto_heal_enabled') is not None:
-        pipeline.auto_heal_enabled = data['auto_heal_enabled']
-    
-    if data.get('heal_script') is not None:
-        pipeline.heal_script = data['heal_script']
-    
-    if data.get('tags') is not None:
-        pipeline.tags = data['tags']
-    
-    if data.get('data_source_id') is not None:
-        pipeline.data_source_id = data['data_source_id']
+    try:
+        payload = PipelineUpdate.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify(validation_error(e)), 400
     
-    pipeline.updated_at = datetime.utcnow()
+    values = payload.model_dump(exclude_unset=True)
     
     try:
+        # A single UPDATE ... RETURNING both scopes the change to the organization and applies it
+        pipeline = db.session.execute(
+            update(Pipeline)
+            .where(Pipeline.id == pipeline_id, Pipeline.organization_id == org_id)
+            .values(**values)
+            .returning(Pipeline)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        
+        if not pipeline:
+            return jsonify({'error': 'Pipeline not found'}), 404
+        
+        # Core UPDATEs skip mapper events, so mark the listings stale here
+        mark_org_cache_stale(db.session, 'pipelines', org_id)
+        pipeline_data = pipeline.to_dict()
         db.session.commit()
+        
         return jsonify({
             'message': 'Pipeline updated successfully',
-            'pipeline': pipeline.to_dict()
+            'pipeline': pipeline_data
         }), 200
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_unique_violation(e):
+            return jsonify({'error': 'Pipeline name already exists'}), 409
+        return jsonify({'error': 'Failed to update pipeline', 'details': str(e)}), 500
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to update pipeline', 'details': str(e)}), 500
@@ -240,13 +265,13 @@ def update_pipeline(pipeline_id):
 @jwt_required()
 def delete_pipeline(pipeline_id):
     """Delete pipeline"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
     pipeline = Pipeline.query.filter_by(
         id=pipeline_id, 
-        organization_id=org.id
+        organization_id=org_id
     ).first()
     
     if not pipeline:
@@ -254,6 +279,15 @@ def delete_pipeline(pipeline_id):
     
     try:
         db.session.delete(pipeline)
+        db.session.execute(
+            update(Organization)
+            .where(Organization.id == org_id)
+            # Clamped at zero so a counter that has drifted low can't go negative
+            .values(pipeline_count=case(
+                (Organization.pipeline_count > 0, Organization.pipeline_count - 1), else_=0
+            ))
+            .execution_options(synchronize_session=False)
+        )
         db.session.commit()
         
         return jsonify({'message': 'Pipeline deleted successfully'}), 200
@@ -266,68 +300,79 @@ def delete_pipeline(pipeline_id):
 @jwt_required()
 def get_pipeline_runs(pipeline_id):
     """Get pipeline runs"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    pipeline = Pipeline.query.filter_by(
-        id=pipeline_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not pipeline:
-        return jsonify({'error': 'Pipeline not found'}), 404
-    
     # Query parameters
     status = request.args.get('status')
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
-    # Build query
-    query = PipelineRun.query.filter_by(pipeline_id=pipeline_id)
+    # Build query; runs carry organization_id, so ownership is checked in the same query
+    # and the pipeline lookup below only runs when a page comes back empty
+    query = PipelineRun.query.filter_by(pipeline_id=pipeline_id, organization_id=org_id)
     
     if status:
-        query = query.filter_by(status=RunStatus(status))
+        status_enum = parse_enum(_RUN_STATUS_MAP, status)
+        if status_enum is None:
+            return jsonify({'error': 'Invalid status'}), 400
+        query = query.filter_by(status=status_enum)
     
-    # Pagination
-    runs = query.order_by(desc(PipelineRun.started_at)).paginate(
-        page=page, per_page=per_page, error_out=False
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = paginate_keyset(
+                query.statement, PipelineRun.started_at, PipelineRun.id, request.args['cursor'], per_page,
+                scalars=True
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        if not items and not _pipeline_exists(pipeline_id, org_id):
+            return jsonify({'error': 'Pipeline not found'}), 404
+        
+        return jsonify({
+            'runs': [run.to_dict() for run in items],
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
+        }), 200
+    
+    # Page-based pagination; COUNT(*) only when the client asks for totals
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    runs, pagination = paginate_no_count(
+        query.order_by(desc(PipelineRun.started_at)), page, per_page, include_total
     )
     
+    if not runs and not _pipeline_exists(pipeline_id, org_id):
+        return jsonify({'error': 'Pipeline not found'}), 404
+    
     return jsonify({
-        'runs': [run.to_dict() for run in runs.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': runs.total,
-            'pages': runs.pages,
-            'has_next': runs.has_next,
-            'has_prev': runs.has_prev
-        }
+        'runs': [run.to_dict() for run in runs],
+        'pagination': pagination
     }), 200
 
 @pipelines_bp.route('/<int:pipeline_id>/runs/<int:run_id>', methods=['GET'])
 @jwt_required()
 def get_pipeline_run(pipeline_id, run_id):
     """Get specific pipeline run"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    pipeline = Pipeline.query.filter_by(
-        id=pipeline_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not pipeline:
-        return jsonify({'error': 'Pipeline not found'}), 404
-    
+    # Runs carry organization_id, so ownership is checked in the same query
     run = PipelineRun.query.filter_by(
         id=run_id,
-        pipeline_id=pipeline_id
+        pipeline_id=pipeline_id,
+        organization_id=org_id
     ).first()
     
     if not run:
+        if not _pipeline_exists(pipeline_id, org_id):
+            return jsonify({'error': 'Pipeline not found'}), 404
         return jsonify({'error': 'Pipeline run not found'}), 404
     
     return jsonify({'run': run.to_dict()}), 200
@@ -336,44 +381,47 @@ def get_pipeline_run(pipeline_id, run_id):
 @jwt_required()
 def trigger_pipeline(pipeline_id):
     """Manually trigger pipeline execution"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    pipeline = Pipeline.query.filter_by(
-        id=pipeline_id, 
-        organization_id=org.id
-    ).first()
+    status = db.session.execute(
+        select(Pipeline.status).where(Pipeline.id == pipeline_id, Pipeline.organization_id == org_id)
+    ).scalar()
     
-    if not pipeline:
+    if status is None:
         return jsonify({'error': 'Pipeline not found'}), 404
     
-    if pipeline.status != PipelineStatus.ACTIVE:
+    if status != PipelineStatus.ACTIVE:
         return jsonify({'error': 'Pipeline is not active'}), 400
     
     data = request.get_json() or {}
     
     try:
         # Create pipeline run
-        run = PipelineRun(
+        run = insert_returning(
+            PipelineRun,
             pipeline_id=pipeline_id,
+            organization_id=org_id,
             status=RunStatus.PENDING,
             input_data=data.get('input_data', {}),
             retry_count=0,
             is_retry=False
         )
         
-        db.session.add(run)
+        run_data = run.to_dict()
         db.session.commit()
         
-        # TODO: Trigger actual pipeline execution via Celery task
-        # from app.tasks import execute_pipeline
-        # execute_pipeline.delay(run.id)
+        # Execute on a Celery worker; imported here since app.tasks needs the app's celery instance
+        from app.tasks import execute_pipeline
+        execute_pipeline.delay(run_data['id'])
         
+        status_url = url_for('pipelines.get_pipeline_run', pipeline_id=pipeline_id, run_id=run_data['id'])
         return jsonify({
             'message': 'Pipeline triggered successfully',
-            'run': run.to_dict()
-        }), 200
+            'run': run_data,
+            'status_url': status_url
+        }), 202, {'Location': status_url}
         
     except Exception as e:
         db.session.rollback()
@@ -381,49 +429,73 @@ def trigger_pipeline(pipeline_id):
 
 @pipelines_bp.route('/<int:pipeline_id>/metrics', methods=['GET'])
 @jwt_required()
+@private_cache(max_age=15)
 def get_pipeline_metrics(pipeline_id):
     """Get pipeline metrics"""
-    user, org = get_current_user_org()
-    if not org:
+    org_id = get_current_org_id()
+    if not org_id:
         return jsonify({'error': 'Organization not found'}), 404
     
-    pipeline = Pipeline.query.filter_by(
-        id=pipeline_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not pipeline:
-        return jsonify({'error': 'Pipeline not found'}), 404
-    
     # Query parameters
     metric_name = request.args.get('metric_name')
-    days = int(request.args.get('days', 30))
+    days = get_days_arg()
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 100)), 1000)
     
-    # Build query
-    query = PipelineMetric.query.filter_by(pipeline_id=pipeline_id)
+    # Polled by the UI; repeats are served from the cached, already encoded body
+    cache_key = org_cache_key('pipelines', org_id, request.path, request.query_string.decode(), 'body')
+    body = cache.get(cache_key)
+    if body is not None:
+        return Response(body, mimetype='application/json'), 200
+    
+    # Build query; metrics carry organization_id, so ownership is checked in the same query
+    # and the pipeline lookup below only runs when a page comes back empty
+    query = db.session.query(*_METRIC_COLS).filter(
+        PipelineMetric.pipeline_id == pipeline_id, PipelineMetric.organization_id == org_id
+    )
     
     if metric_name:
-        query = query.filter_by(metric_name=metric_name)
+        query = query.filter(PipelineMetric.metric_name == metric_name)
     
     # Filter by date range
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     query = query.filter(PipelineMetric.recorded_at >= cutoff_date)
     
-    # Pagination
-    metrics = query.order_by(desc(PipelineMetric.recorded_at)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    # Keyset pagination when a cursor is supplied (empty cursor = first page)
+    if 'cursor' in request.args:
+        try:
+            stmt = keyset_select(
+                query.statement, PipelineMetric.recorded_at, PipelineMetric.id, request.args['cursor'], per_page
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        def pagination(last, has_next):
+            return {
+                'per_page': per_page,
+                'next_cursor': keyset_cursor(last, PipelineMetric.recorded_at, PipelineMetric.id) if has_next else None,
+                'has_next': has_next
+            }
+    else:
+        # Page-based pagination; COUNT(*) only when the client asks for totals
+        page = max(page, 1)
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        total = query.order_by(None).count() if include_total else None
+        stmt = (
+            query.order_by(desc(PipelineMetric.recorded_at))
+            .limit(per_page + 1).offset((page - 1) * per_page).statement
+        )
+        
+        def pagination(last, has_next):
+            return page_pagination(page, per_page, has_next, total)
+    
+    # Pages run up to 1000 rows: stream them as they are fetched (a server-side cursor on
+    # Postgres) instead of materializing every row dict before encoding
+    rows = iter(db.session.execute(stmt.execution_options(yield_per=200)))
+    first = next(rows, None)
+    if first is None and not _pipeline_exists(pipeline_id, org_id):
+        return jsonify({'error': 'Pipeline not found'}), 404
     
-    return jsonify({
-        'metrics': [metric.to_dict() for metric in metrics.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': metrics.total,
-            'pages': metrics.pages,
-            'has_next': metrics.has_next,
-            'has_prev': metrics.has_prev
-        }
-    }), 200 
\ No newline at end of file
+    page_rows = chain([first], rows) if first is not None else ()
+    body = stream_json_page('metrics', page_rows, _metric_row_to_dict, per_page, pagination)
+    return Response(stream_with_context(cache_stream(cache_key, body)), mimetype='application/json'), 200 
\ No newline at end of file
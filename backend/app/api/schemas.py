@@ -0,0 +1,124 @@
+from app.models.monitoring import DataSourceType, HealthCheckType
+from app.models.pipeline import PipelineType, PipelineStatus
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Annotated, ClassVar, Optional
+
+# Required text and JSON fields reject empty values, matching the old `if not data.get(field)` checks
+NonEmptyStr = Annotated[str, Field(min_length=1)]
+NonEmptyDict = Annotated[dict, Field(min_length=1)]
+
+# Validation error types reported as a missing field rather than an invalid one
+_MISSING_ERROR_TYPES = {'missing', 'string_too_short', 'too_short'}
+
+class RequestSchema(BaseModel):
+    """Base for request body schemas"""
+    # The frontend posts whole form state, so unknown keys are ignored rather than rejected
+    model_config = ConfigDict(extra='ignore')
+    
+    # Fields for which an empty string means "leave unchanged" (update schemas)
+    blank_as_unset: ClassVar[tuple] = ()
+    
+    @model_validator(mode='before')
+    @classmethod
+    def _drop_unset_values(cls, data):
+        # Explicit nulls behave as if the field were omitted, so defaults still apply
+        if isinstance(data, dict):
+            data = {
+                key: value for key, value in data.items()
+                if value is not None and not (value == '' and key in cls.blank_as_unset)
+            }
+        return data
+
+def validation_error(error):
+    """Build the 400 response body for a failed schema validation"""
+    details = []
+    for err in error.errors():
+        field = '.'.join(str(part) for part in err['loc']) or 'body'
+        details.append({'field': field, 'message': err['msg']})
+    
+    first = error.errors()[0]
+    field = details[0]['field']
+    if first['type'] in _MISSING_ERROR_TYPES:
+        message = f'{field} is required'
+    else:
+        message = f"Invalid {field}: {first['msg']}"
+    return {'error': message, 'details': details}
+
+class DataSourceCreate(RequestSchema):
+    """Request body for creating a data source"""
+    name: NonEmptyStr
+    description: Optional[str] = None
+    source_type: DataSourceType
+    connection_config: NonEmptyDict
+    credentials: Optional[dict] = None
+    is_active: bool = True
+    check_interval_seconds: int = 300
+    timeout_seconds: int = 30
+    tags: list = Field(default_factory=list)
+
+class DataSourceUpdate(RequestSchema):
+    """Request body for updating a data source; unset fields are left unchanged"""
+    blank_as_unset: ClassVar[tuple] = ('name', 'source_type')
+    
+    name: Optional[str] = None
+    description: Optional[str] = None
+    source_type: Optional[DataSourceType] = None
+    connection_config: Optional[dict] = None
+    credentials: Optional[dict] = None
+    is_active: Optional[bool] = None
+    check_interval_seconds: Optional[int] = None
+    timeout_seconds: Optional[int] = None
+    tags: Optional[list] = None
+
+class HealthCheckCreate(RequestSchema):
+    """Request body for creating a health check"""
+    name: NonEmptyStr
+    description: Optional[str] = None
+    check_type: HealthCheckType
+    config: NonEmptyDict
+    data_source_id: int
+    is_active: bool = True
+    check_interval_seconds: int = 300
+    warning_threshold: Optional[float] = None
+    critical_threshold: Optional[float] = None
+    alert_on_warning: bool = True
+    alert_on_critical: bool = True
+
+class PipelineCreate(RequestSchema):
+    """Request body for creating a pipeline"""
+    name: NonEmptyStr
+    description: Optional[str] = None
+    pipeline_type: PipelineType
+    config: dict = Field(default_factory=dict)
+    schedule: Optional[str] = None
+    timeout_minutes: int = 60
+    retry_attempts: int = 3
+    retry_delay_minutes: int = 5
+    health_check_enabled: bool = True
+    freshness_threshold_hours: int = 24
+    volume_threshold_percent: float = 10.0
+    auto_heal_enabled: bool = False
+    heal_script: Optional[str] = None
+    tags: list = Field(default_factory=list)
+    data_source_id: Optional[int] = None
+
+class PipelineUpdate(RequestSchema):
+    """Request body for updating a pipeline; unset fields are left unchanged"""
+    blank_as_unset: ClassVar[tuple] = ('name', 'pipeline_type', 'status')
+    
+    name: Optional[str] = None
+    description: Optional[str] = None
+    pipeline_type: Optional[PipelineType] = None
+    status: Optional[PipelineStatus] = None
+    config: Optional[dict] = None
+    schedule: Optional[str] = None
+    timeout_minutes: Optional[int] = None
+    retry_attempts: Optional[int] = None
+    retry_delay_minutes: Optional[int] = None
+    health_check_enabled: Optional[bool] = None
+    freshness_threshold_hours: Optional[int] = None
+    volume_threshold_percent: Optional[float] = None
+    auto_heal_enabled: Optional[bool] = None
+    heal_script: Optional[str] = None
+    tags: Optional[list] = None
+    data_source_id: Optional[int] = None
@@ -1,77 +1,114 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models import User, Role, Organization
+from app import db, cache
+from app.api.utils import (
+    ROLES_CACHE_KEY, cache_stream, get_current_identity, get_current_org_id, get_current_user_org, get_role_id,
+    insert_role, is_unique_violation, mark_org_cache_stale, org_cache_key, page_pagination, raiseload_options, stream_json_page
+)
+from app.models import User, Role, Organization, Pipeline
 from app.models.user import RoleEnum
-from datetime import datetime
+from sqlalchemy import event, false, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session, selectinload
 import json
+import math
 
 users_bp = Blueprint('users', __name__)
 
-def get_current_user_org():
-    """Get current user and organization"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user, user.organization if user else None
+# Cache timeouts (seconds); roles are shared by all organizations and only ever added
+USERS_CACHE_TIMEOUT = 60
+ROLES_CACHE_TIMEOUT = 300
+
+# Basic permissions for roles created on demand; copied into a list when a role is created
+_ROLE_PERMISSIONS = {
+    RoleEnum.ADMIN: ('*',),
+    RoleEnum.MANAGER: ('view_pipelines', 'edit_pipelines', 'view_alerts', 'manage_users'),
+    RoleEnum.ANALYST: ('view_pipelines', 'view_alerts', 'view_dashboard'),
+    RoleEnum.VIEWER: ('view_dashboard',)
+}
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _mark_users_stale(mapper, connection, target):
+    session = object_session(target)
+    mark_org_cache_stale(session, 'users', target.organization_id)
+    mark_org_cache_stale(session, 'profile', target.organization_id)
+
+@event.listens_for(Organization, 'after_update')
+@event.listens_for(Pipeline, 'after_insert')
+@event.listens_for(Pipeline, 'after_delete')
+def _mark_profiles_stale(mapper, connection, target):
+    """Profiles embed the organization, including its pipeline count"""
+    org_id = target.id if isinstance(target, Organization) else target.organization_id
+    mark_org_cache_stale(object_session(target), 'profile', org_id)
 
 @users_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_users():
     """Get all users in the organization"""
-    user, org = get_current_user_org()
-    if not org:
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Check if user has permission to view users
-    if not user.is_manager():
+    if not identity.is_manager():
         return jsonify({'error': 'Insufficient permissions'}), 403
     
+    cache_key = org_cache_key('users', identity.org_id, request.query_string.decode(), 'body')
+    body = cache.get(cache_key)
+    if body is not None:
+        return Response(body, mimetype='application/json'), 200
+    
     # Query parameters
     role = request.args.get('role')
     is_active = request.args.get('is_active')
     page = int(request.args.get('page', 1))
     per_page = min(int(request.args.get('per_page', 20)), 100)
     
-    # Build query
-    query = User.query.filter_by(organization_id=org.id)
+    # Build query; to_dict() reads each user's role, so load the page's roles in one batch
+    query = User.query.options(
+        selectinload(User.role), *raiseload_options(User)
+    ).filter_by(organization_id=identity.org_id)
     
     if role:
-        query = query.join(Role).filter(Role.name == role)
+        # Resolve the name through the cached role id lookup and filter on the foreign key, no join
+        role_id = get_role_id(role)
+        query = query.filter(User.role_id == role_id if role_id is not None else false())
     if is_active is not None:
         query = query.filter_by(is_active=is_active.lower() == 'true')
     
-    # Pagination
-    users = query.order_by(User.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return jsonify({
-        'users': [user.to_dict() for user in users.items],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': users.total,
-            'pages': users.pages,
-            'has_next': users.has_next,
-            'has_prev': users.has_prev
-        }
-    }), 200
+    # Pagination (out-of-range values fall back like Flask-SQLAlchemy's paginate())
+    page = max(page, 1)
+    if per_page < 1:
+        per_page = 20
+    total = query.order_by(None).count()
+    
+    def pagination(last, has_next):
+        return page_pagination(page, per_page, page < math.ceil(total / per_page), total)
+    
+    # Encode users as they are fetched instead of building the whole page's dicts first
+    users = query.order_by(User.created_at.desc()).limit(per_page).offset((page - 1) * per_page).yield_per(50)
+    body = stream_json_page('users', users, User.to_dict, per_page, pagination)
+    return Response(
+        stream_with_context(cache_stream(cache_key, body, timeout=USERS_CACHE_TIMEOUT)), mimetype='application/json'
+    ), 200
 
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
     """Get specific user details"""
-    current_user, org = get_current_user_org()
-    if not org:
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Users can only view their own profile unless they're managers
-    if current_user.id != user_id and not current_user.is_manager():
+    if identity.user_id != user_id and not identity.is_manager():
         return jsonify({'error': 'Insufficient permissions'}), 403
     
     user = User.query.filter_by(
         id=user_id, 
-        organization_id=org.id
+        organization_id=identity.org_id
     ).first()
     
     if not user:
@@ -83,12 +120,12 @@ def get_user(user_id):
 @jwt_required()
 def create_user():
     """Create a new user in the organization"""
-    current_user, org = get_current_user_org()
-    if not org:
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Only managers can create users
-    if not current_user.is_manager():
+    if not identity.is_manager():
         return jsonify({'error': 'Insufficient permissions'}), 403
     
     data = request.get_json()
@@ -99,11 +136,20 @@ def create_user():
         if not data.get(field):
             return jsonify({'error': f'{field} is required'}), 400
     
-    # Check if user already exists
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 409
+    # Hash before the first query: once the session has a connection checked out it holds it
+    # until commit, and the pool shouldn't sit idle in a transaction for the length of bcrypt
+    password_hash = User.hash_password(data['password'])
     
-    if User.query.filter_by(username=data['username']).first():
+    # Check if user already exists (email and username in one round trip)
+    existing = db.session.execute(
+        select(User.email, User.username)
+        .where(or_(User.email == data['email'], User.username == data['username']))
+        .order_by((User.email == data['email']).desc())
+        .limit(1)
+    ).first()
+    if existing:
+        if existing.email == data['email']:
+            return jsonify({'error': 'Email already registered'}), 409
         return jsonify({'error': 'Username already taken'}), 409
     
     # Validate role
@@ -113,23 +159,13 @@ def create_user():
         return jsonify({'error': 'Invalid role'}), 400
     
     # Get or create role
-    role = Role.query.filter_by(name=role_enum.value).first()
-    if not role:
+    role_id = get_role_id(role_enum.value)
+    created_role = role_id is None
+    if created_role:
         # Create role with basic permissions
-        permissions = {
-            RoleEnum.ADMIN: ['*'],
-            RoleEnum.MANAGER: ['view_pipelines', 'edit_pipelines', 'view_alerts', 'manage_users'],
-            RoleEnum.ANALYST: ['view_pipelines', 'view_alerts', 'view_dashboard'],
-            RoleEnum.VIEWER: ['view_dashboard']
-        }
-        
-        role = Role(
-            name=role_enum.value,
-            description=f'{role_enum.value.title()} role',
-            permissions=permissions.get(role_enum, [])
+        role_id = insert_role(
+            role_enum.value, f'{role_enum.value.title()} role', list(_ROLE_PERMISSIONS.get(role_enum, ()))
         )
-        db.session.add(role)
-        db.session.flush()
     
     try:
         new_user = User(
@@ -137,15 +173,17 @@ def create_user():
             username=data['username'],
             first_name=data['first_name'],
             last_name=data['last_name'],
-            organization_id=org.id,
-            role_id=role.id,
+            organization_id=identity.org_id,
+            role_id=role_id,
             is_active=data.get('is_active', True),
-            is_verified=data.get('is_verified', True)
+            is_verified=data.get('is_verified', True),
+            password_hash=password_hash
         )
-        new_user.password = data['password']
         
         db.session.add(new_user)
         db.session.commit()
+        if created_role:
+            cache.delete(ROLES_CACHE_KEY)
         
         return jsonify({
             'message': 'User created successfully',
@@ -160,80 +198,101 @@ def create_user():
 @jwt_required()
 def update_user(user_id):
     """Update user"""
-    current_user, org = get_current_user_org()
-    if not org:
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Users can only update their own profile unless they're managers
-    if current_user.id != user_id and not current_user.is_manager():
+    if identity.user_id != user_id and not identity.is_manager():
         return jsonify({'error': 'Insufficient permissions'}), 403
     
-    user = User.query.filter_by(
-        id=user_id, 
-        organization_id=org.id
-    ).first()
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     data = request.get_json()
+    values = {}
     
     # Update fields
     if data.get('first_name'):
-        user.first_name = data['first_name']
+        values['first_name'] = data['first_name']
     
     if data.get('last_name'):
-        user.last_name = data['last_name']
+        values['last_name'] = data['last_name']
     
     if data.get('username'):
-        # Check if username is already taken
-        existing_user = User.query.filter_by(username=data['username']).first()
-        if existing_user and existing_user.id != user.id:
-            return jsonify({'error': 'Username already taken'}), 409
-        user.username = data['username']
+        values['username'] = data['username']
     
     # Only managers can update these fields
-    if current_user.is_manager():
+    if identity.is_manager():
         if data.get('email'):
-            # Check if email is already taken
-            existing_user = User.query.filter_by(email=data['email']).first()
-            if existing_user and existing_user.id != user.id:
-                return jsonify({'error': 'Email already registered'}), 409
-            user.email = data['email']
+            values['email'] = data['email']
         
         if data.get('role'):
             try:
                 role_enum = RoleEnum(data['role'])
-                role = Role.query.filter_by(name=role_enum.value).first()
-                if role:
-                    user.role_id = role.id
+                role_id = get_role_id(role_enum.value)
+                if role_id is not None:
+                    values['role_id'] = role_id
                 else:
                     return jsonify({'error': 'Role not found'}), 404
             except ValueError:
                 return jsonify({'error': 'Invalid role'}), 400
         
         if data.get('is_active') is not None:
-            user.is_active = data['is_active']
+            values['is_active'] = data['is_active']
         
         if data.get('is_verified') is not None:
-            user.is_verified = data['is_verified']
+            values['is_verified'] = data['is_verified']
     
-    # Password update (users can update their own password)
+    # Password update (users can update their own password); hashed before touching the database
     if data.get('password'):
-        if current_user.id == user_id or current_user.is_manager():
-            user.password = data['password']
-        else:
-            return jsonify({'error': 'Insufficient permissions'}), 403
+        values['password_hash'] = User.hash_password(data['password'])
     
-    user.updated_at = datetime.utcnow()
+    scope = (User.id == user_id, User.organization_id == identity.org_id)
+    
+    if not values:
+        user = db.session.execute(
+            select(User).options(selectinload(User.role)).where(*scope)
+        ).scalar_one_or_none()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        return jsonify({
+            'message': 'User updated successfully',
+            'user': user.to_dict()
+        }), 200
     
     try:
+        # A single UPDATE ... RETURNING both scopes the change to the organization and applies it;
+        # username/email clashes surface as unique violations instead of a pre-SELECT
+        user = db.session.execute(
+            update(User)
+            .where(*scope)
+            .values(**values)
+            .returning(User)
+            .options(selectinload(User.role))
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Core UPDATEs skip mapper events, so mark the cached listings and identities stale here
+        for namespace in ('users', 'profile', 'identity'):
+            mark_org_cache_stale(db.session, namespace, identity.org_id)
+        user_data = user.to_dict()
         db.session.commit()
+        
         return jsonify({
             'message': 'User updated successfully',
-            'user': user.to_dict()
+            'user': user_data
         }), 200
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_unique_violation(e):
+            # The violated constraint is named on the first line (users_username_key / users.username)
+            if 'username' in str(e.orig).split('\n', 1)[0]:
+                return jsonify({'error': 'Username already taken'}), 409
+            return jsonify({'error': 'Email already registered'}), 409
+        return jsonify({'error': 'Failed to update user', 'details': str(e)}), 500
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to update user', 'details': str(e)}), 500
@@ -242,21 +301,21 @@ def update_user(user_id):
 @jwt_required()
 def delete_user(user_id):
     """Delete user"""
-    current_user, org = get_current_user_org()
-    if not org:
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Only managers can delete users
-    if not current_user.is_manager():
+    if not identity.is_manager():
         return jsonify({'error': 'Insufficient permissions'}), 403
     
     # Users cannot delete themselves
-    if current_user.id == user_id:
+    if identity.user_id == user_id:
         return jsonify({'error': 'Cannot delete your own account'}), 400
     
     user = User.query.filter_by(
         id=user_id, 
-        organization_id=org.id
+        organization_id=identity.org_id
     ).first()
     
     if not user:
@@ -276,50 +335,64 @@ def delete_user(user_id):
 @jwt_required()
 def get_roles():
     """Get available roles"""
-    current_user, org = get_current_user_org()
-    if not org:
+    identity = get_current_identity()
+    if not identity:
         return jsonify({'error': 'Organization not found'}), 404
     
     # Only managers can view roles
-    if not current_user.is_manager():
+    if not identity.is_manager():
         return jsonify({'error': 'Insufficient permissions'}), 403
     
-    roles = Role.query.all()
-    
-    return jsonify({
-        'roles': [
-            {
-                'name': role.name,
-                'description': role.description,
-                'permissions': role.permissions
-            }
-            for role in roles
-        ]
-    }), 200
+    result = cache.get(ROLES_CACHE_KEY)
+    if result is None:
+        roles = Role.query.all()
+        result = {
+            'roles': [
+                {
+                    'name': role.name,
+                    'description': role.description,
+                    'permissions': role.permissions
+                }
+                for role in roles
+            ]
+        }
+        cache.set(ROLES_CACHE_KEY, result, timeout=ROLES_CACHE_TIMEOUT)
+    
+    return jsonify(result), 200
 
 @users_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
     """Get current user's profile"""
-    current_user, org = get_current_user_org()
-    if not org:
-        return jsonify({'error': 'Organization not found'}), 404
+    # Keyed from the token claims, so a cache hit skips loading the user
+    cache_key = org_cache_key('profile', get_current_org_id(), get_jwt_identity())
+    result = cache.get(cache_key)
+    if result is None:
+        current_user, org = get_current_user_org()
+        if not org:
+            return jsonify({'error': 'Organization not found'}), 404
+        
+        result = {
+            'user': current_user.to_dict(),
+            'organization': org.to_dict()
+        }
+        cache.set(cache_key, result, timeout=USERS_CACHE_TIMEOUT)
     
-    return jsonify({
-        'user': current_user.to_dict(),
-        'organization': org.to_dict()
-    }), 200
+    return jsonify(result), 200
 
 @users_bp.route('/profile', methods=['PUT'])
 @jwt_required()
 def update_profile():
     """Update current user's profile"""
+    data = request.get_json()
+    
+    # Hash before loading the user so bcrypt doesn't run inside the open transaction
+    password_hash = User.hash_password(data['password']) if data.get('password') else None
+    
     current_user, org = get_current_user_org()
     if not org:
         return jsonify({'error': 'Organization not found'}), 404
     
-    data = request.get_json()
-    
     # Update allowed fields
     if data.get('first_name'):
         current_user.first_name = data['first_name']
@@ -334,10 +407,8 @@ def update_profile():
             return jsonify({'error': 'Username already taken'}), 409
         current_user.username = data['username']
     
-    if data.get('password'):
-        current_user.password = data['password']
-    
-    current_user.updated_at = datetime.utcnow()
+    if password_hash:
+        current_user.password_hash = password_hash
     
     try:
         db.session.commit()
@@ -0,0 +1,309 @@
+from flask import current_app, g, make_response, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from app import db, cache
+from app.models import User, Role
+from app.models.user import MANAGER_ROLES
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import wraps
+from typing import NamedTuple, Optional
+from sqlalchemy import event, func, insert, select, tuple_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import MANYTOONE, Load, Session, joinedload, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+import base64
+import json
+import math
+
+def raiseload_options(*entities):
+    """Loader options that make lazy loads on the given root entities raise in development"""
+    if not current_app.config.get('RAISE_ON_LAZY_LOAD'):
+        return []
+    # Surface accidental lazy loads during development instead of silently querying
+    return [Load(entity).raiseload('*') for entity in entities]
+
+def load_user_with_org(user_id):
+    """Load a user together with its organization and role in a single query"""
+    options = [joinedload(User.organization), joinedload(User.role), *raiseload_options(User)]
+    
+    return db.session.execute(
+        select(User).options(*options).where(User.id == user_id)
+    ).scalar_one_or_none()
+
+def insert_returning(model, **values):
+    """INSERT one row with RETURNING and get it back as a model instance.
+    
+    Skips the unit-of-work flush. ORM bulk inserts don't run mapper events, so after_insert
+    is dispatched here to keep listeners (such as cache invalidation) working; callers must
+    set any column a before_insert listener would have filled in.
+    
+    A row that was just inserted has no children yet, so its child relationships are marked as
+    loaded and empty; to_dict() can then read them without a lazy SELECT per relationship.
+    """
+    obj = db.session.execute(insert(model).values(**values).returning(model)).scalar_one()
+    state = sa_inspect(obj)
+    for relationship in state.mapper.relationships:
+        if relationship.direction is not MANYTOONE:
+            set_committed_value(obj, relationship.key, [] if relationship.uselist else None)
+    state.mapper.dispatch.after_insert(state.mapper, db.session.connection(), state)
+    return obj
+
+# Cache key for the role listing; callers that create a role delete it after commit
+ROLES_CACHE_KEY = 'roles'
+
+def get_role_id(role_name):
+    """Look up a role id by name, cached since roles don't change once created"""
+    cache_key = f'role_id:{role_name}'
+    role_id = cache.get(cache_key)
+    if role_id is None:
+        role_id = db.session.execute(select(Role.id).where(Role.name == role_name)).scalar()
+        if role_id is not None:
+            cache.set(cache_key, role_id, timeout=600)
+    return role_id
+
+def insert_role(name, description, permissions):
+    """Create a role and return its id; if a concurrent request created it first, return that one's"""
+    role_id = db.session.execute(
+        pg_insert(Role)
+        .values(name=name, description=description, permissions=permissions)
+        .on_conflict_do_nothing(index_elements=['name'])
+        .returning(Role.id)
+    ).scalar()
+    if role_id is None:
+        role_id = db.session.execute(select(Role.id).where(Role.name == name)).scalar_one()
+    return role_id
+
+# Upper bound for `days` lookback windows, so a request can't ask for an unbounded range scan
+MAX_LOOKBACK_DAYS = 365
+
+def get_days_arg(default=30):
+    """Read the `days` query parameter, clamped to 1..MAX_LOOKBACK_DAYS (default when malformed)"""
+    days = request.args.get('days', default, type=int)
+    return max(1, min(days, MAX_LOOKBACK_DAYS))
+
+def parse_enum(mapping, value):
+    """Return the enum member for a request value from a value -> member map, or None if it isn't valid"""
+    return mapping.get(value) if isinstance(value, str) else None
+
+def is_unique_violation(error):
+    """Whether an IntegrityError was raised by a UNIQUE constraint"""
+    # psycopg2 reports the SQLSTATE; SQLite (development) only says so in the message
+    return getattr(error.orig, 'pgcode', None) == '23505' or 'UNIQUE constraint failed' in str(error.orig)
+
+def token_claims(user):
+    """Build the additional JWT claims for a user, so requests can scope by org without a User SELECT"""
+    return {'org_id': user.organization_id}
+
+def get_current_user_org():
+    """Get current user and organization, memoized for the current request"""
+    if 'user_org' not in g:
+        user = load_user_with_org(get_jwt_identity())
+        g.user_org = (user, user.organization if user else None)
+    return g.user_org
+
+def get_current_org_id():
+    """Get the current user's organization id from the token claims"""
+    org_id = get_jwt().get('org_id')
+    if org_id is None:
+        # Tokens issued before org_id was embedded: fetch just the foreign key, once per request
+        if 'org_id' not in g:
+            g.org_id = db.session.execute(
+                select(User.organization_id).where(User.id == get_jwt_identity())
+            ).scalar()
+        org_id = g.org_id
+    return org_id
+
+class Identity(NamedTuple):
+    """The fields of the current user that permission checks need"""
+    user_id: int
+    org_id: int
+    role: Optional[str]
+    # Defaulted so identities cached before the field existed still load
+    username: Optional[str] = None
+    
+    def is_manager(self):
+        return self.role in MANAGER_ROLES
+
+# Identities are invalidated whenever a user changes; the timeout only bounds stale keys
+IDENTITY_CACHE_TIMEOUT = 3600
+
+def get_current_identity():
+    """Get the current user's identity, cached across requests; None if the user no longer exists.
+    
+    Handlers that only check permissions use this instead of loading the user and
+    organization; ones that read or modify the user still call get_current_user_org().
+    """
+    if 'identity' not in g:
+        cache_key = org_cache_key('identity', get_current_org_id(), get_jwt_identity())
+        identity = cache.get(cache_key)
+        if identity is None:
+            user, org = get_current_user_org()
+            if org:
+                identity = Identity(user.id, org.id, user.role.name if user.role else None, user.username)
+                cache.set(cache_key, identity, timeout=IDENTITY_CACHE_TIMEOUT)
+        g.identity = identity
+    return g.identity
+
+def paginate_rows(stmt, page, per_page):
+    """Page-based pagination for a column select(), counting the total like db.paginate().
+    
+    Returns the page rows and the pagination dict for the response.
+    """
+    page = max(page, 1)
+    rows = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).all()
+    total = db.session.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar()
+    return rows, page_pagination(page, per_page, page * per_page < total, total)
+
+def paginate_no_count(query, page, per_page, include_total=False):
+    """Fetch one page of an ordered query, probing one extra row for has_next.
+    
+    Returns the page items and the pagination dict for the response. The COUNT(*) behind
+    total/pages only runs when include_total is set; otherwise both are None.
+    """
+    page = max(page, 1)
+    rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    total = query.order_by(None).count() if include_total else None
+    return rows[:per_page], page_pagination(page, per_page, len(rows) > per_page, total)
+
+def page_pagination(page, per_page, has_next, total=None):
+    """Build the pagination dict for a page-based response; pages is only known with a total"""
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': None if total is None else math.ceil(total / per_page),
+        'has_next': has_next,
+        'has_prev': page > 1
+    }
+
+def encode_cursor(timestamp, row_id):
+    """Encode a (timestamp, id) keyset position as an opaque cursor string"""
+    payload = json.dumps([timestamp.isoformat(), row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def paginate_keyset(stmt, sort_column, id_column, cursor, per_page, scalars=False):
+    """Seek-paginate a select() newest-first on (sort_column, id_column).
+    
+    Returns the page rows and the cursor for the next page (None on the last page).
+    Fetches one extra row to detect a next page, so no COUNT(*) or OFFSET scan is needed.
+    Pass scalars=True for a single-entity select to get model instances instead of rows.
+    """
+    result = db.session.execute(keyset_select(stmt, sort_column, id_column, cursor, per_page))
+    rows = result.scalars().all() if scalars else result.all()
+    
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        next_cursor = keyset_cursor(items[-1], sort_column, id_column)
+    return items, next_cursor
+
+def keyset_select(stmt, sort_column, id_column, cursor, per_page):
+    """Seek a select() past the cursor, newest first, fetching one extra row to detect a next page"""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(sort_column, id_column) < (timestamp, row_id))
+    return stmt.order_by(sort_column.desc(), id_column.desc()).limit(per_page + 1)
+
+def keyset_cursor(row, sort_column, id_column):
+    """Cursor pointing just past the given row"""
+    return encode_cursor(getattr(row, sort_column.key), getattr(row, id_column.key))
+
+def stream_json_page(key, rows, row_to_dict, per_page, pagination):
+    """Encode {key: [...], 'pagination': {...}} chunk by chunk as rows are fetched.
+    
+    rows holds up to per_page + 1 rows, the extra one only signalling a next page.
+    pagination(last_row, has_next) builds the pagination dict once the rows run out.
+    """
+    dumpb = current_app.json.dumpb
+    yield b'{' + dumpb(key) + b':['
+    separator = b''
+    count, last = 0, None
+    for row in rows:
+        count += 1
+        if count <= per_page:
+            yield separator + dumpb(row_to_dict(row))
+            separator = b','
+            last = row
+    yield b'],"pagination":' + dumpb(pagination(last, count > per_page)) + b'}'
+
+def cache_stream(cache_key, chunks, timeout=None):
+    """Pass a streamed body through, caching it once the last chunk has been sent"""
+    body = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    cache.set(cache_key, b''.join(body), timeout=timeout)
+
+def private_cache(max_age):
+    """Let the caller's browser reuse a successful response for max_age seconds"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.cache_control.private = True
+                response.cache_control.max_age = max_age
+                # Responses are per user; don't let a cached one outlive a token switch
+                response.vary.add('Authorization')
+            return response
+        return wrapper
+    return decorator
+
+def org_cache_key(namespace, org_id, *parts):
+    """Build a cache key scoped to the organization's current cache generation"""
+    generation = cache.get(f'{namespace}:{org_id}:generation') or 0
+    return ':'.join(str(part) for part in (namespace, org_id, generation) + parts)
+
+def invalidate_org_cache(namespace, org_id):
+    """Invalidate every cached entry in a namespace for the organization"""
+    # Bumping the generation orphans old keys; they age out via their timeout.
+    # Flask-Caching doesn't proxy inc(), so use the backend's (atomic INCR on Redis)
+    cache.cache.inc(f'{namespace}:{org_id}:generation')
+
+def mark_org_cache_stale(session, namespace, org_id):
+    """Invalidate the organization's cache namespace once the session's transaction commits"""
+    session.info.setdefault('stale_org_caches', set()).add((namespace, org_id))
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_stale_org_caches(session):
+    # Invalidate only once the changes are visible to other requests
+    for namespace, org_id in session.info.pop('stale_org_caches', ()):
+        invalidate_org_cache(namespace, org_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stale_org_caches(session):
+    session.info.pop('stale_org_caches', None)
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _mark_identities_stale(mapper, connection, target):
+    mark_org_cache_stale(object_session(target), 'identity', target.organization_id)
+
+# Shared pool for fanning out independent queries; each task checks out its own connection,
+# so keep the total comfortably below SQLALCHEMY_ENGINE_OPTIONS pool_size + max_overflow
+_query_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='query')
+
+def run_concurrently(*funcs):
+    """Run independent callables on worker threads and return their results in order.
+    
+    Each call runs inside its own app context and therefore its own session, so callables
+    must not touch request-bound ORM objects and should return plain data (dicts, rows)
+    rather than instances that would be detached once the context ends.
+    """
+    app = current_app._get_current_object()
+    
+    def call(func):
+        with app.app_context():
+            return func()
+    
+    futures = [_query_executor.submit(call, func) for func in funcs]
+    return [future.result() for future in futures]
@@ -1,5 +1,8 @@
 import os
 from datetime import timedelta
+from sqlalchemy.pool import NullPool
+from app.json_provider import dumps_column
+import orjson
 
 class Config:
     """Base configuration class"""
@@ -11,11 +14,60 @@ class Config:
     # Database
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'postgresql://localhost/dataops_monitoring'
+    # Per process: each Gunicorn worker needs a connection per request thread (8, see the
+    # Dockerfile) plus one per query executor thread (8, app.api.utils), so pool_size covers
+    # both and overflow absorbs the rest; keep workers x (pool_size + max_overflow) below the
+    # server's max_connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'query_cache_size': 1200,  # Compiled statement cache, sized for our ad-hoc filter combinations
+        'pool_pre_ping': True,
+        'pool_size': 16,
+        'max_overflow': 4,
+        'pool_timeout': 30,  # Seconds to wait for a free connection before erroring
+        'pool_recycle': 1800,  # Replace connections before server/proxy idle timeouts drop them
+        # JSON columns (configs, tags, result details) are encoded/decoded per row; use orjson
+        'json_serializer': dumps_column,
+        'json_deserializer': orjson.loads
+    }
+    # Make listing queries raise on unintended lazy loads (N+1 queries); always on in tests,
+    # opt-in elsewhere since it turns a missed eager load into a 500
+    RAISE_ON_LAZY_LOAD = os.environ.get('RAISE_ON_LAZY_LOAD', '').lower() in ('1', 'true')
+    
+    # Request bodies are small JSON documents; reject oversized ones before they are read and parsed
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 1024 * 1024))
+    
+    # CORS
+    CORS_ORIGINS = (os.environ.get('CORS_ORIGINS') or 'http://localhost:3000').split(',')
     
     # Redis/Celery
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379'
     CELERY_BROKER_URL = REDIS_URL
     CELERY_RESULT_BACKEND = REDIS_URL
+    CELERY_TASK_SERIALIZER = 'json'
+    CELERY_RESULT_SERIALIZER = 'json'
+    CELERY_ACCEPT_CONTENT = ['json']
+    CELERY_RESULT_EXPIRES = 3600
+    CELERY_BROKER_POOL_LIMIT = 10
+    # Acknowledge after the task finishes so a crashed worker's task is redelivered once the
+    # visibility timeout passes; keep the timeout above the longest expected task runtime
+    CELERY_TASK_ACKS_LATE = True
+    CELERY_TASK_REJECT_ON_WORKER_LOST = True
+    CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+    CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 3600}
+    CELERY_REDIS_MAX_CONNECTIONS = 20  # Result backend connection pool size
+    CELERY_INCLUDE = ['app.tasks']
+    CELERY_BEAT_SCHEDULE = {
+        'refresh-daily-rollups': {
+            'task': 'app.tasks.refresh_daily_rollups',
+            'schedule': 300.0  # Every 5 minutes
+        }
+    }
+    
+    # Caching
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or 'RedisCache'
+    CACHE_REDIS_URL = REDIS_URL
+    CACHE_KEY_PREFIX = 'dataops:'
+    CACHE_DEFAULT_TIMEOUT = 30
     
     # External Services
     SLACK_WEBHOOK_URL = os.environ.get('SLACK_WEBHOOK_URL')
@@ -39,13 +91,15 @@ class Config:
     DATA_RETENTION_DAYS = 90
     
     # Security
-    BCRYPT_LOG_ROUNDS = 12
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     TESTING = False
     SQLALCHEMY_ECHO = True
+    AUTO_CREATE_TABLES = True
+    BCRYPT_LOG_ROUNDS = 10  # Cheaper hashing for local logins
 
 class ProductionConfig(Config):
     """Production configuration"""
@@ -66,4 +120,14 @@ class TestingConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'postgresql://localhost/dataops_monitoring_test'
     WTF_CSRF_ENABLED = False
-    BCRYPT_LOG_ROUNDS = 4  # Faster for testing 
\ No newline at end of file
+    BCRYPT_LOG_ROUNDS = 4  # Faster for testing
+    AUTO_CREATE_TABLES = True
+    RAISE_ON_LAZY_LOAD = True
+    CACHE_TYPE = 'NullCache' 
+    # No pooling, so connections (and their session state) never carry over between tests
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'query_cache_size': 1200,
+        'poolclass': NullPool,
+        'json_serializer': dumps_column,
+        'json_deserializer': orjson.loads
+    }
\ No newline at end of file
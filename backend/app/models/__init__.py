@@ -2,4 +2,5 @@ from .user import User, Role
 from .pipeline import Pipeline, PipelineRun, PipelineMetric
 from .alert import Alert, AlertRule, AlertHistory
 from .monitoring import DataSource, HealthCheck, HealthCheckResult
-from .organization import Organization, OrganizationSettings 
\ No newline at end of file
+from .organization import Organization, OrganizationSettings
+from .rollup import PipelineDailyStats, HealthCheckDailyStats, AlertDailyStats
@@ -1,7 +1,11 @@
 from app import db
+from app.models.functions import utcnow
 from datetime import datetime
+from functools import cached_property
+from sqlalchemy import event, func, select
 from enum import Enum
 import json
+import operator
 
 class AlertSeverity(Enum):
     INFO = 'info'
@@ -22,9 +26,46 @@ class AlertChannel(Enum):
     WEBHOOK = 'webhook'
     IN_APP = 'in_app'
 
+# Comparisons allowed for health check metric thresholds; other operators skip the check
+_METRIC_OPERATORS = {'>': operator.gt, '<': operator.lt, '==': operator.eq}
+
+def _context_predicate(key, compare, expected, default=None):
+    """Predicate testing compare(context_data[key], expected)"""
+    return lambda context_data: compare(context_data.get(key, default), expected)
+
+def _compile_conditions(rule_type, conditions):
+    """Turn a rule's conditions into predicates that must all hold for it to trigger.
+    
+    Returns None for rule types that never trigger.
+    """
+    predicates = []
+    if rule_type in ('pipeline_failure', 'health_check') and 'status' in conditions:
+        predicates.append(_context_predicate('status', operator.eq, conditions['status']))
+    
+    if rule_type == 'pipeline_failure':
+        if 'failure_count' in conditions:
+            predicates.append(_context_predicate('failure_count', operator.ge, conditions['failure_count'], 0))
+        if 'duration_threshold' in conditions:
+            predicates.append(_context_predicate('duration_seconds', operator.ge, conditions['duration_threshold'], 0))
+    elif rule_type == 'health_check':
+        compare = _METRIC_OPERATORS.get(conditions.get('operator', '>'))
+        if 'metric_threshold' in conditions and compare:
+            predicates.append(_context_predicate('metric_value', compare, conditions['metric_threshold'], 0))
+    elif rule_type != 'custom':
+        # Unknown rule types never trigger; custom conditions aren't implemented yet and always match
+        return None
+    
+    return tuple(predicates)
+
 class AlertRule(db.Model):
     """Alert rule configuration"""
     __tablename__ = 'alert_rules'
+    __table_args__ = (
+        # Rule listings filter by organization (and optionally type), newest first;
+        # trailing id lets keyset pagination walk the index backwards without a sort
+        db.Index('ix_alert_rules_org_created', 'organization_id', 'created_at', 'id'),
+        db.Index('ix_alert_rules_org_type_created', 'organization_id', 'rule_type', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -48,7 +89,7 @@ class AlertRule(db.Model):
     # Status
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     
     # Foreign keys
     organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False)
@@ -64,80 +105,59 @@ class AlertRule(db.Model):
         if not self.is_active:
             return False
         
+        last_alert = self.get_last_alert() if self.cooldown_minutes else None
+        return self._should_trigger_since(last_alert.created_at if last_alert else None, context_data)
+    
+    @classmethod
+    def evaluate_batch(cls, rules, context_data):
+        """Return the rules that should trigger for the context, fetching every cooldown in one query"""
+        rules = [rule for rule in rules if rule.is_active]
+        last_alert_times = cls.last_alert_times([rule.id for rule in rules if rule.cooldown_minutes])
+        return [
+            rule for rule in rules
+            if rule._should_trigger_since(last_alert_times.get(rule.id), context_data)
+        ]
+    
+    @staticmethod
+    def last_alert_times(rule_ids):
+        """Map rule ids to the creation time of their most recent alert (rules without alerts are omitted)"""
+        if not rule_ids:
+            return {}
+        return dict(db.session.execute(
+            select(Alert.alert_rule_id, func.max(Alert.created_at))
+            .where(Alert.alert_rule_id.in_(rule_ids))
+            .group_by(Alert.alert_rule_id)
+        ).all())
+    
+    def _should_trigger_since(self, last_alert_at, context_data):
+        """Check cooldown and conditions, given when this rule last raised an alert"""
         # Check cooldown
-        if self.cooldown_minutes:
-            last_alert = self.get_last_alert()
-            if last_alert:
-                time_since_last = (datetime.utcnow() - last_alert.created_at).total_seconds() / 60
-                if time_since_last < self.cooldown_minutes:
-                    return False
-        
-        # Evaluate conditions based on rule type
-        if self.rule_type == 'pipeline_failure':
-            return self._evaluate_pipeline_conditions(context_data)
-        elif self.rule_type == 'health_check':
-            return self._evaluate_health_check_conditions(context_data)
-        elif self.rule_type == 'custom':
-            return self._evaluate_custom_conditions(context_data)
-        
-        return False
-    
-    def _evaluate_pipeline_conditions(self, context_data):
-        """Evaluate pipeline-specific conditions"""
-        conditions = self.conditions
-        
-        # Check pipeline status
-        if 'status' in conditions:
-            if context_data.get('status') != conditions['status']:
-                return False
-        
-        # Check failure count
-        if 'failure_count' in conditions:
-            if context_data.get('failure_count', 0) < conditions['failure_count']:
-                return False
-        
-        # Check duration threshold
-        if 'duration_threshold' in conditions:
-            if context_data.get('duration_seconds', 0) < conditions['duration_threshold']:
+        if self.cooldown_minutes and last_alert_at:
+            time_since_last = (datetime.utcnow() - last_alert_at).total_seconds() / 60
+            if time_since_last < self.cooldown_minutes:
                 return False
         
-        return True
+        return self._conditions_met(context_data)
     
-    def _evaluate_health_check_conditions(self, context_data):
-        """Evaluate health check-specific conditions"""
-        conditions = self.conditions
-        
-        # Check health check status
-        if 'status' in conditions:
-            if context_data.get('status') != conditions['status']:
-                return False
-        
-        # Check metric thresholds
-        if 'metric_threshold' in conditions:
-            metric_value = context_data.get('metric_value', 0)
-            threshold = conditions['metric_threshold']
-            operator = conditions.get('operator', '>')
-            
-            if operator == '>' and metric_value <= threshold:
-                return False
-            elif operator == '<' and metric_value >= threshold:
-                return False
-            elif operator == '==' and metric_value != threshold:
-                return False
-        
-        return True
+    @cached_property
+    def _predicates(self):
+        """The rule's conditions compiled once; reset when they're reassigned or reloaded"""
+        return _compile_conditions(self.rule_type, self.conditions)
     
-    def _evaluate_custom_conditions(self, context_data):
-        """Evaluate custom conditions"""
-        # This would be implemented based on custom logic
-        # For now, return True if conditions are met
+    def _conditions_met(self, context_data):
+        """Evaluate the rule's conditions against the context"""
+        predicates = self._predicates
+        if predicates is None:
+            return False
+        for predicate in predicates:
+            if not predicate(context_data):
+                return False
         return True
     
     def get_last_alert(self):
         """Get the most recent alert for this rule"""
-        if not self.alerts:
-            return None
-        return max(self.alerts, key=lambda x: x.created_at)
+        # Read through ix_alerts_rule_created rather than loading the rule's whole alert history
+        return Alert.query.filter_by(alert_rule_id=self.id).order_by(Alert.created_at.desc()).first()
     
     def to_dict(self):
         """Convert alert rule to dictionary"""
@@ -159,16 +179,36 @@ class AlertRule(db.Model):
             'created_by': self.created_by,
             'pipeline_id': self.pipeline_id,
             'health_check_id': self.health_check_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
         return f'<AlertRule {self.name} ({self.rule_type})>'
 
+@event.listens_for(AlertRule.rule_type, 'set')
+@event.listens_for(AlertRule.conditions, 'set')
+def _reset_rule_predicates(target, value, oldvalue, initiator):
+    target.__dict__.pop('_predicates', None)
+
+@event.listens_for(AlertRule, 'expire')
+@event.listens_for(AlertRule, 'refresh')
+def _reset_reloaded_rule_predicates(target, *args):
+    target.__dict__.pop('_predicates', None)
+
 class Alert(db.Model):
     """Individual alert instance"""
     __tablename__ = 'alerts'
+    __table_args__ = (
+        # Alert listings filter by organization plus optional status/severity, newest first;
+        # status and severity ride along so dashboard counts need not visit the heap
+        db.Index('ix_alerts_org_created', 'organization_id', 'created_at', 'id',
+                 postgresql_include=['status', 'severity']),
+        db.Index('ix_alerts_org_status_created', 'organization_id', 'status', 'created_at'),
+        db.Index('ix_alerts_org_severity_created', 'organization_id', 'severity', 'created_at'),
+        # A rule's most recent alert, for cooldown checks
+        db.Index('ix_alerts_rule_created', 'alert_rule_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     alert_rule_id = db.Column(db.Integer, db.ForeignKey('alert_rules.id'), nullable=False)
@@ -186,7 +226,7 @@ class Alert(db.Model):
     
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     acknowledged_at = db.Column(db.DateTime)
     resolved_at = db.Column(db.DateTime)
     acknowledged_by = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -217,14 +257,12 @@ class Alert(db.Model):
         self.status = AlertStatus.ACKNOWLEDGED
         self.acknowledged_at = datetime.utcnow()
         self.acknowledged_by = user_id
-        self.updated_at = datetime.utcnow()
     
     def resolve(self, user_id):
         """Resolve the alert"""
         self.status = AlertStatus.RESOLVED
         self.resolved_at = datetime.utcnow()
         self.resolved_by = user_id
-        self.updated_at = datetime.utcnow()
     
     def get_duration_minutes(self):
         """Get duration of alert in minutes"""
@@ -254,10 +292,10 @@ class Alert(db.Model):
             'is_acknowledged': self.is_acknowledged(),
             'is_resolved': self.is_resolved(),
             'duration_minutes': self.get_duration_minutes(),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'acknowledged_at': self.acknowledged_at.isoformat() if self.acknowledged_at else None,
-            'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'acknowledged_at': self.acknowledged_at,
+            'resolved_at': self.resolved_at,
             'acknowledged_by': self.acknowledged_by,
             'resolved_by': self.resolved_by
         }
@@ -268,6 +306,9 @@ class Alert(db.Model):
 class AlertHistory(db.Model):
     """Alert history for tracking changes and notifications"""
     __tablename__ = 'alert_history'
+    __table_args__ = (
+        db.Index('ix_alert_history_alert_created', 'alert_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     alert_id = db.Column(db.Integer, db.ForeignKey('alerts.id'), nullable=False)
@@ -296,10 +337,10 @@ class AlertHistory(db.Model):
             'description': self.description,
             'channel': self.channel.value if self.channel else None,
             'recipient': self.recipient,
-            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'sent_at': self.sent_at,
             'success': self.success,
             'error_message': self.error_message,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at,
             'created_by': self.created_by
         }
     
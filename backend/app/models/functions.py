@@ -0,0 +1,17 @@
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+class utcnow(FunctionElement):
+    """The database's current UTC time as a naive timestamp, matching datetime.utcnow()"""
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(utcnow, 'postgresql')
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite (development) keeps CURRENT_TIMESTAMP in UTC already
+    return 'CURRENT_TIMESTAMP'
@@ -1,5 +1,8 @@
 from app import db
+from app.models.functions import utcnow
 from datetime import datetime
+from sqlalchemy import and_, event, select
+from sqlalchemy.orm import aliased
 from enum import Enum
 import json
 
@@ -26,9 +29,34 @@ class HealthCheckStatus(Enum):
     CRITICAL = 'critical'
     UNKNOWN = 'unknown'
 
+# Connection string builders by source type; types without one have no connection string
+_CONNECTION_STRING_BUILDERS = {
+    DataSourceType.POSTGRESQL: lambda config: (
+        f"postgresql://{config.get('username')}:{config.get('password')}"
+        f"@{config.get('host')}:{config.get('port', 5432)}/{config.get('database')}"
+    ),
+    DataSourceType.MYSQL: lambda config: (
+        f"mysql://{config.get('username')}:{config.get('password')}"
+        f"@{config.get('host')}:{config.get('port', 3306)}/{config.get('database')}"
+    ),
+    DataSourceType.SNOWFLAKE: lambda config: (
+        f"snowflake://{config.get('username')}:{config.get('password')}"
+        f"@{config.get('account')}/{config.get('database')}/{config.get('schema')}"
+    ),
+    DataSourceType.API: lambda config: config.get('base_url')
+}
+
 class DataSource(db.Model):
     """Data source configuration for monitoring"""
     __tablename__ = 'data_sources'
+    __table_args__ = (
+        # Dashboard counters split an organization's data sources by is_active
+        db.Index('ix_data_sources_org_active', 'organization_id', 'is_active'),
+        # Listings walk an organization's data sources newest first (trailing id for keyset pagination)
+        db.Index('ix_data_sources_org_created', 'organization_id', 'created_at', 'id'),
+        # Data source names are unique per organization; writes rely on this instead of a preflight SELECT
+        db.UniqueConstraint('organization_id', 'name', name='uq_data_sources_org_name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -47,7 +75,7 @@ class DataSource(db.Model):
     # Metadata
     tags = db.Column(db.JSON, default=list)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     last_checked_at = db.Column(db.DateTime)
     
     # Foreign keys
@@ -59,18 +87,8 @@ class DataSource(db.Model):
     
     def get_connection_string(self):
         """Get connection string based on source type"""
-        config = self.connection_config
-        
-        if self.source_type == DataSourceType.POSTGRESQL:
-            return f"postgresql://{config.get('username')}:{config.get('password')}@{config.get('host')}:{config.get('port', 5432)}/{config.get('database')}"
-        elif self.source_type == DataSourceType.MYSQL:
-            return f"mysql://{config.get('username')}:{config.get('password')}@{config.get('host')}:{config.get('port', 3306)}/{config.get('database')}"
-        elif self.source_type == DataSourceType.SNOWFLAKE:
-            return f"snowflake://{config.get('username')}:{config.get('password')}@{config.get('account')}/{config.get('database')}/{config.get('schema')}"
-        elif self.source_type == DataSourceType.API:
-            return config.get('base_url')
-        
-        return None
+        builder = _CONNECTION_STRING_BUILDERS.get(self.source_type)
+        return builder(self.connection_config) if builder else None
     
     def is_healthy(self):
         """Check if data source is healthy based on latest health checks"""
@@ -81,9 +99,7 @@ class DataSource(db.Model):
     
     def get_latest_health_check(self):
         """Get the most recent health check result"""
-        if not self.health_checks:
-            return None
-        return max(self.health_checks, key=lambda x: x.checked_at)
+        return self.latest_result
     
     def to_dict(self):
         """Convert data source to dictionary"""
@@ -99,11 +115,11 @@ class DataSource(db.Model):
             'timeout_seconds': self.timeout_seconds,
             'tags': self.tags,
             'organization_id': self.organization_id,
-            'is_healthy': self.is_healthy(),
+            'is_healthy': latest_check is not None and latest_check.is_healthy(),
             'latest_health_check': latest_check.to_dict() if latest_check else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'last_checked_at': self.last_checked_at.isoformat() if self.last_checked_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'last_checked_at': self.last_checked_at
         }
     
     def __repr__(self):
@@ -112,6 +128,10 @@ class DataSource(db.Model):
 class HealthCheck(db.Model):
     """Health check configuration for data sources"""
     __tablename__ = 'health_checks'
+    __table_args__ = (
+        db.Index('ix_health_checks_org_active', 'organization_id', 'is_active'),
+        db.Index('ix_health_checks_org_created', 'organization_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -133,7 +153,7 @@ class HealthCheck(db.Model):
     
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     
     # Foreign keys
     data_source_id = db.Column(db.Integer, db.ForeignKey('data_sources.id'), nullable=False)
@@ -144,7 +164,7 @@ class HealthCheck(db.Model):
     
     def get_latest_result(self):
         """Get the most recent health check result"""
-        return self.results[0] if self.results else None
+        return self.latest_result
     
     def is_healthy(self):
         """Check if health check is currently healthy"""
@@ -178,21 +198,54 @@ class HealthCheck(db.Model):
             'alert_on_critical': self.alert_on_critical,
             'data_source_id': self.data_source_id,
             'organization_id': self.organization_id,
-            'is_healthy': self.is_healthy(),
+            'is_healthy': latest_result is not None and latest_result.is_healthy(),
             'latest_result': latest_result.to_dict() if latest_result else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
         return f'<HealthCheck {self.name} ({self.check_type.value})>'
 
+def _format_check_duration(duration_seconds):
+    """Format a check duration as e.g. '250ms', '1.5s' or '2m 3.0s'; None for a missing or zero duration"""
+    if not duration_seconds:
+        return None
+    
+    if duration_seconds < 1:
+        return f"{duration_seconds * 1000:.0f}ms"
+    elif duration_seconds < 60:
+        return f"{duration_seconds:.1f}s"
+    else:
+        minutes = int(duration_seconds // 60)
+        seconds = duration_seconds % 60
+        return f"{minutes}m {seconds:.1f}s"
+
 class HealthCheckResult(db.Model):
     """Individual health check execution result"""
     __tablename__ = 'health_check_results'
+    __table_args__ = (
+        # Latest-result lookups range-scan a check's results by time; status rides along
+        # so they can be answered from the index alone
+        db.Index('ix_health_check_results_check_checked', 'health_check_id', 'checked_at', 'id',
+                 postgresql_include=['status']),
+        # Organization-wide activity and metrics scan results by time without joining health checks
+        db.Index('ix_health_check_results_org_checked', 'organization_id', 'checked_at',
+                 postgresql_include=['status']),
+        # Only the rare non-healthy results, for warning/critical counts and lookups
+        db.Index('ix_health_check_results_unhealthy', 'health_check_id', 'checked_at',
+                 postgresql_include=['status'],
+                 postgresql_where=db.text("status IN ('WARNING', 'CRITICAL')")),
+        # Results are append-only, so checked_at follows physical order; the rollup refresh
+        # scans recent results across all organizations through this small BRIN index
+        db.Index('ix_health_check_results_checked_brin', 'checked_at',
+                 postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     health_check_id = db.Column(db.Integer, db.ForeignKey('health_checks.id'), nullable=False)
+    # Copied from the health check on insert so organization-scoped queries skip the join
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False)
     
     # Result details
     status = db.Column(db.Enum(HealthCheckStatus), nullable=False)
@@ -225,37 +278,82 @@ class HealthCheckResult(db.Model):
     
     def get_duration_formatted(self):
         """Get formatted duration string"""
-        if not self.duration_seconds:
-            return None
-        
-        if self.duration_seconds < 1:
-            return f"{self.duration_seconds * 1000:.0f}ms"
-        elif self.duration_seconds < 60:
-            return f"{self.duration_seconds:.1f}s"
-        else:
-            minutes = int(self.duration_seconds // 60)
-            seconds = self.duration_seconds % 60
-            return f"{minutes}m {seconds:.1f}s"
+        return _format_check_duration(self.duration_seconds)
     
     def to_dict(self):
         """Convert result to dictionary"""
+        status = self.status
+        duration_seconds = self.duration_seconds
         return {
             'id': self.id,
             'health_check_id': self.health_check_id,
-            'status': self.status.value,
-            'checked_at': self.checked_at.isoformat(),
-            'duration_seconds': self.duration_seconds,
-            'duration_formatted': self.get_duration_formatted(),
+            'status': status.value,
+            'checked_at': self.checked_at,
+            'duration_seconds': duration_seconds,
+            'duration_formatted': _format_check_duration(duration_seconds),
             'metric_value': self.metric_value,
             'metric_unit': self.metric_unit,
             'message': self.message,
             'details': self.details,
             'error_message': self.error_message,
             'context_data': self.context_data,
-            'is_healthy': self.is_healthy(),
-            'is_warning': self.is_warning(),
-            'is_critical': self.is_critical()
+            'is_healthy': status == HealthCheckStatus.HEALTHY,
+            'is_warning': status == HealthCheckStatus.WARNING,
+            'is_critical': status == HealthCheckStatus.CRITICAL
         }
     
     def __repr__(self):
-        return f'<HealthCheckResult {self.id} - {self.status.value}>' 
\ No newline at end of file
+        return f'<HealthCheckResult {self.id} - {self.status.value}>'
+
+def _check_latest_result_join():
+    newer = aliased(HealthCheckResult)
+    latest_id = (
+        select(newer.id)
+        .where(newer.health_check_id == HealthCheck.id)
+        .order_by(newer.checked_at.desc(), newer.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return and_(HealthCheckResult.health_check_id == HealthCheck.id, HealthCheckResult.id == latest_id)
+
+def _source_latest_result_join():
+    newer = aliased(HealthCheckResult)
+    check = aliased(HealthCheck)
+    # Correlated through the secondary health_checks row; loaders alias it but not the parent here
+    latest_id = (
+        select(newer.id)
+        .join(check, check.id == newer.health_check_id)
+        .where(check.data_source_id == HealthCheck.data_source_id)
+        .order_by(newer.checked_at.desc(), newer.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return and_(HealthCheckResult.health_check_id == HealthCheck.id, HealthCheckResult.id == latest_id)
+
+# Newest result (ties broken by id) per health check and per data source as read-only scalar
+# relationships. Lazy loads and selectinload fetch just that row through an ORDER BY ... LIMIT 1
+# subquery on ix_health_check_results_check_checked instead of loading every result. The joins
+# are built when mappers are configured, since aliasing a model needs all of them registered.
+HealthCheck.latest_result = db.relationship(
+    HealthCheckResult,
+    primaryjoin=_check_latest_result_join,
+    uselist=False,
+    viewonly=True
+)
+
+DataSource.latest_result = db.relationship(
+    HealthCheckResult,
+    secondary=HealthCheck.__table__,
+    primaryjoin=lambda: DataSource.id == HealthCheck.data_source_id,
+    secondaryjoin=_source_latest_result_join,
+    uselist=False,
+    viewonly=True
+)
+
+@event.listens_for(HealthCheckResult, 'before_insert')
+def _copy_health_check_organization(mapper, connection, target):
+    """Fill the denormalized organization_id from the owning health check"""
+    if target.organization_id is None:
+        target.organization_id = connection.scalar(
+            select(HealthCheck.organization_id).where(HealthCheck.id == target.health_check_id)
+        )
@@ -1,4 +1,5 @@
 from app import db
+from app.models.functions import utcnow
 from datetime import datetime
 from enum import Enum
 
@@ -7,6 +8,14 @@ class SubscriptionTier(Enum):
     PROFESSIONAL = 'professional'
     ENTERPRISE = 'enterprise'
 
+# Pipelines allowed per subscription tier; -1 means unlimited
+PIPELINE_LIMITS = {
+    SubscriptionTier.STARTER: 10,
+    SubscriptionTier.PROFESSIONAL: 50,
+    SubscriptionTier.ENTERPRISE: -1
+}
+DEFAULT_PIPELINE_LIMIT = 10
+
 class Organization(db.Model):
     """Organization model for multi-tenant support"""
     __tablename__ = 'organizations'
@@ -17,10 +26,13 @@ class Organization(db.Model):
     domain = db.Column(db.String(100))
     subscription_tier = db.Column(db.Enum(SubscriptionTier), default=SubscriptionTier.STARTER)
     is_active = db.Column(db.Boolean, default=True)
+    # Maintained by the pipeline create/delete endpoints so limit checks don't count rows
+    pipeline_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     
     # Relationships
+    users = db.relationship('User', back_populates='organization', lazy=True)
     settings = db.relationship('OrganizationSettings', backref='organization', uselist=False)
     pipelines = db.relationship('Pipeline', backref='organization', lazy=True)
     data_sources = db.relationship('DataSource', backref='organization', lazy=True)
@@ -28,20 +40,12 @@ class Organization(db.Model):
     
     def get_pipeline_limit(self):
         """Get pipeline limit based on subscription tier"""
-        limits = {
-            SubscriptionTier.STARTER: 10,
-            SubscriptionTier.PROFESSIONAL: 50,
-            SubscriptionTier.ENTERPRISE: -1  # Unlimited
-        }
-        return limits.get(self.subscription_tier, 10)
+        return PIPELINE_LIMITS.get(self.subscription_tier, DEFAULT_PIPELINE_LIMIT)
     
     def can_add_pipeline(self):
         """Check if organization can add more pipelines"""
-        if self.subscription_tier == SubscriptionTier.ENTERPRISE:
-            return True
-        current_count = len(self.pipelines)
         limit = self.get_pipeline_limit()
-        return current_count < limit
+        return limit < 0 or self.pipeline_count < limit
     
     def to_dict(self):
         """Convert organization to dictionary"""
@@ -53,9 +57,9 @@ class Organization(db.Model):
             'subscription_tier': self.subscription_tier.value,
             'is_active': self.is_active,
             'pipeline_limit': self.get_pipeline_limit(),
-            'current_pipelines': len(self.pipelines),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'current_pipelines': self.pipeline_count,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
@@ -95,7 +99,7 @@ class OrganizationSettings(db.Model):
     locale = db.Column(db.String(10), default='en')
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     
     def to_dict(self):
         """Convert settings to dictionary"""
@@ -118,8 +122,8 @@ class OrganizationSettings(db.Model):
             'company_name': self.company_name,
             'timezone': self.timezone,
             'locale': self.locale,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
@@ -1,8 +1,14 @@
 from app import db
-from datetime import datetime
+from app.models.functions import utcnow
+from datetime import datetime, timedelta
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import aliased
 from enum import Enum
 import json
 
+# Default lookback of Pipeline.get_uptime_percentage()
+UPTIME_WINDOW_DAYS = 30
+
 class PipelineType(Enum):
     ETL = 'etl'
     ELT = 'elt'
@@ -27,9 +33,37 @@ class RunStatus(Enum):
     CANCELLED = 'cancelled'
     TIMEOUT = 'timeout'
 
+# Terminal run statuses, and the failed subset of them
+_COMPLETED_STATUSES = (RunStatus.SUCCESS, RunStatus.FAILED, RunStatus.CANCELLED, RunStatus.TIMEOUT)
+_FAILED_STATUSES = (RunStatus.FAILED, RunStatus.TIMEOUT)
+
+def _format_run_duration(duration_seconds):
+    """Format a run duration as e.g. '1h 2m 3s'; None for a missing or zero duration"""
+    if not duration_seconds:
+        return None
+    
+    hours = int(duration_seconds // 3600)
+    minutes = int((duration_seconds % 3600) // 60)
+    seconds = int(duration_seconds % 60)
+    
+    if hours > 0:
+        return f"{hours}h {minutes}m {seconds}s"
+    elif minutes > 0:
+        return f"{minutes}m {seconds}s"
+    else:
+        return f"{seconds}s"
+
 class Pipeline(db.Model):
     """Data pipeline model"""
     __tablename__ = 'pipelines'
+    __table_args__ = (
+        # Dashboard counters group an organization's pipelines by status
+        db.Index('ix_pipelines_org_status', 'organization_id', 'status'),
+        # Listings walk an organization's pipelines newest first (trailing id for keyset pagination)
+        db.Index('ix_pipelines_org_created', 'organization_id', 'created_at', 'id'),
+        # Pipeline names are unique per organization; writes rely on this instead of a preflight SELECT
+        db.UniqueConstraint('organization_id', 'name', name='uq_pipelines_org_name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -56,7 +90,7 @@ class Pipeline(db.Model):
     # Metadata
     tags = db.Column(db.JSON, default=list)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     last_run_at = db.Column(db.DateTime)
     next_run_at = db.Column(db.DateTime)
     
@@ -72,7 +106,7 @@ class Pipeline(db.Model):
     
     def get_latest_run(self):
         """Get the most recent pipeline run"""
-        return self.runs[0] if self.runs else None
+        return self.latest_run
     
     def get_latest_successful_run(self):
         """Get the most recent successful pipeline run"""
@@ -83,7 +117,10 @@ class Pipeline(db.Model):
     
     def is_healthy(self):
         """Check if pipeline is healthy based on latest run and metrics"""
-        latest_run = self.get_latest_run()
+        return self.is_healthy_for_run(self.get_latest_run())
+    
+    def is_healthy_for_run(self, latest_run):
+        """Check health against an already fetched latest run"""
         if not latest_run:
             return False
         
@@ -99,22 +136,32 @@ class Pipeline(db.Model):
         
         return True
     
-    def get_uptime_percentage(self, days=30):
+    def get_uptime_percentage(self, days=UPTIME_WINDOW_DAYS):
         """Calculate uptime percentage for the last N days"""
-        from datetime import timedelta
-        
+        return Pipeline.uptime_percentages([self.id], days).get(self.id, 0.0)
+    
+    @staticmethod
+    def uptime_percentages(pipeline_ids, days=UPTIME_WINDOW_DAYS):
+        """Map pipeline ids to their uptime percentage for the last N days (pipelines without runs are omitted)"""
+        if not pipeline_ids:
+            return {}
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        recent_runs = [run for run in self.runs if run.started_at >= cutoff_date]
-        
-        if not recent_runs:
-            return 0.0
-        
-        successful_runs = [run for run in recent_runs if run.status == RunStatus.SUCCESS]
-        return (len(successful_runs) / len(recent_runs)) * 100
+        rows = db.session.execute(
+            select(
+                PipelineRun.pipeline_id,
+                func.count().filter(PipelineRun.status == RunStatus.SUCCESS),
+                func.count()
+            )
+            .where(PipelineRun.pipeline_id.in_(pipeline_ids), PipelineRun.started_at >= cutoff_date)
+            .group_by(PipelineRun.pipeline_id)
+        ).all()
+        return {pipeline_id: (successful / total) * 100 for pipeline_id, successful, total in rows}
     
-    def to_dict(self):
-        """Convert pipeline to dictionary"""
+    def to_dict(self, uptime_percentage=None):
+        """Convert pipeline to dictionary; pass uptime_percentage when it was computed in bulk"""
         latest_run = self.get_latest_run()
+        if uptime_percentage is None:
+            uptime_percentage = self.get_uptime_percentage()
         return {
             'id': self.id,
             'name': self.name,
@@ -134,13 +181,13 @@ class Pipeline(db.Model):
             'organization_id': self.organization_id,
             'created_by': self.created_by,
             'data_source_id': self.data_source_id,
-            'is_healthy': self.is_healthy(),
-            'uptime_percentage': self.get_uptime_percentage(),
+            'is_healthy': self.is_healthy_for_run(latest_run),
+            'uptime_percentage': uptime_percentage,
             'latest_run': latest_run.to_dict() if latest_run else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None,
-            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'last_run_at': self.last_run_at,
+            'next_run_at': self.next_run_at
         }
     
     def __repr__(self):
@@ -149,9 +196,24 @@ class Pipeline(db.Model):
 class PipelineRun(db.Model):
     """Individual pipeline execution run"""
     __tablename__ = 'pipeline_runs'
+    __table_args__ = (
+        # Latest-run and uptime lookups range-scan a pipeline's runs by start time;
+        # status rides along so they can be answered from the index alone
+        db.Index('ix_pipeline_runs_pipeline_started', 'pipeline_id', 'started_at', 'id',
+                 postgresql_include=['status']),
+        # Organization-wide activity and metrics scan runs by start time without joining pipelines
+        db.Index('ix_pipeline_runs_org_started', 'organization_id', 'started_at',
+                 postgresql_include=['status']),
+        # Failures (FAILED and TIMEOUT, as in is_failed) are a small slice of all runs; a partial
+        # index keeps failure counts and lookups from reading the successful majority
+        db.Index('ix_pipeline_runs_failed', 'pipeline_id', 'started_at',
+                 postgresql_where=db.text("status IN ('FAILED', 'TIMEOUT')")),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     pipeline_id = db.Column(db.Integer, db.ForeignKey('pipelines.id'), nullable=False)
+    # Copied from the pipeline on insert so organization-scoped queries skip the join
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False)
     
     # Run details
     status = db.Column(db.Enum(RunStatus), default=RunStatus.PENDING)
@@ -180,7 +242,7 @@ class PipelineRun(db.Model):
     
     def is_completed(self):
         """Check if run is completed (success or failed)"""
-        return self.status in [RunStatus.SUCCESS, RunStatus.FAILED, RunStatus.CANCELLED, RunStatus.TIMEOUT]
+        return self.status in _COMPLETED_STATUSES
     
     def is_successful(self):
         """Check if run was successful"""
@@ -188,34 +250,25 @@ class PipelineRun(db.Model):
     
     def is_failed(self):
         """Check if run failed"""
-        return self.status in [RunStatus.FAILED, RunStatus.TIMEOUT]
+        return self.status in _FAILED_STATUSES
     
     def get_duration_formatted(self):
         """Get formatted duration string"""
-        if not self.duration_seconds:
-            return None
-        
-        hours = int(self.duration_seconds // 3600)
-        minutes = int((self.duration_seconds % 3600) // 60)
-        seconds = int(self.duration_seconds % 60)
-        
-        if hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{seconds}s"
+        return _format_run_duration(self.duration_seconds)
     
     def to_dict(self):
         """Convert run to dictionary"""
+        # Serialized per row on run listings; read each instrumented attribute once
+        status = self.status
+        duration_seconds = self.duration_seconds
         return {
             'id': self.id,
             'pipeline_id': self.pipeline_id,
-            'status': self.status.value,
-            'started_at': self.started_at.isoformat(),
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'duration_seconds': self.duration_seconds,
-            'duration_formatted': self.get_duration_formatted(),
+            'status': status.value,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
+            'duration_seconds': duration_seconds,
+            'duration_formatted': _format_run_duration(duration_seconds),
             'input_data': self.input_data,
             'output_data': self.output_data,
             'error_message': self.error_message,
@@ -226,9 +279,9 @@ class PipelineRun(db.Model):
             'retry_count': self.retry_count,
             'is_retry': self.is_retry,
             'original_run_id': self.original_run_id,
-            'is_completed': self.is_completed(),
-            'is_successful': self.is_successful(),
-            'is_failed': self.is_failed()
+            'is_completed': status in _COMPLETED_STATUSES,
+            'is_successful': status == RunStatus.SUCCESS,
+            'is_failed': status in _FAILED_STATUSES
         }
     
     def __repr__(self):
@@ -237,9 +290,18 @@ class PipelineRun(db.Model):
 class PipelineMetric(db.Model):
     """Pipeline performance and health metrics"""
     __tablename__ = 'pipeline_metrics'
+    __table_args__ = (
+        db.Index('ix_pipeline_metrics_pipeline_recorded', 'pipeline_id', 'recorded_at', 'id'),
+        # Metrics are append-only, so recorded_at follows physical order; a BRIN index serves
+        # time-range scans across all pipelines for a fraction of a B-tree's size
+        db.Index('ix_pipeline_metrics_recorded_brin', 'recorded_at',
+                 postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     pipeline_id = db.Column(db.Integer, db.ForeignKey('pipelines.id'), nullable=False)
+    # Copied from the pipeline on insert so organization-scoped queries skip the join
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False)
     
     # Metric details
     metric_name = db.Column(db.String(100), nullable=False)
@@ -250,8 +312,9 @@ class PipelineMetric(db.Model):
     run_id = db.Column(db.Integer, db.ForeignKey('pipeline_runs.id'))
     recorded_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Additional data
-    metadata = db.Column(db.JSON)  # Additional context
+    # Additional data. `metadata` is reserved on declarative classes, so the attribute is
+    # metadata_ while the column, and the to_dict() key, keep the name metadata
+    metadata_ = db.Column('metadata', db.JSON)  # Additional context
     
     def to_dict(self):
         """Convert metric to dictionary"""
@@ -262,9 +325,38 @@ class PipelineMetric(db.Model):
             'metric_value': self.metric_value,
             'metric_unit': self.metric_unit,
             'run_id': self.run_id,
-            'recorded_at': self.recorded_at.isoformat(),
-            'metadata': self.metadata
+            'recorded_at': self.recorded_at,
+            'metadata': self.metadata_
         }
     
     def __repr__(self):
-        return f'<PipelineMetric {self.metric_name}: {self.metric_value} {self.metric_unit}>' 
\ No newline at end of file
+        return f'<PipelineMetric {self.metric_name}: {self.metric_value} {self.metric_unit}>'
+
+def _latest_run_join():
+    newer = aliased(PipelineRun)
+    latest_id = (
+        select(newer.id)
+        .where(newer.pipeline_id == Pipeline.id)
+        .order_by(newer.started_at.desc(), newer.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return and_(PipelineRun.pipeline_id == Pipeline.id, PipelineRun.id == latest_id)
+
+# Newest run (ties broken by id) as a read-only scalar relationship, fetched through an
+# ORDER BY ... LIMIT 1 subquery on ix_pipeline_runs_pipeline_started rather than loading every run
+Pipeline.latest_run = db.relationship(
+    PipelineRun,
+    primaryjoin=_latest_run_join,
+    uselist=False,
+    viewonly=True
+)
+
+@event.listens_for(PipelineRun, 'before_insert')
+@event.listens_for(PipelineMetric, 'before_insert')
+def _copy_pipeline_organization(mapper, connection, target):
+    """Fill the denormalized organization_id from the owning pipeline"""
+    if target.organization_id is None:
+        target.organization_id = connection.scalar(
+            select(Pipeline.organization_id).where(Pipeline.id == target.pipeline_id)
+        )
@@ -0,0 +1,61 @@
+from app import db
+
+class PipelineDailyStats(db.Model):
+    """Daily pipeline run counts, rolled up from pipeline_runs"""
+    __tablename__ = 'pipeline_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('organization_id', 'pipeline_id', 'date', name='uq_pipeline_daily_stats'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id', ondelete='CASCADE'), nullable=False)
+    pipeline_id = db.Column(db.Integer, db.ForeignKey('pipelines.id', ondelete='CASCADE'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    
+    # Counts
+    total_runs = db.Column(db.Integer, nullable=False, default=0)
+    successful_runs = db.Column(db.Integer, nullable=False, default=0)
+    failed_runs = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<PipelineDailyStats {self.pipeline_id} {self.date}>'
+
+class HealthCheckDailyStats(db.Model):
+    """Daily health check result counts, rolled up from health_check_results"""
+    __tablename__ = 'health_check_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('organization_id', 'health_check_id', 'date', name='uq_health_check_daily_stats'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id', ondelete='CASCADE'), nullable=False)
+    health_check_id = db.Column(db.Integer, db.ForeignKey('health_checks.id', ondelete='CASCADE'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    
+    # Counts
+    total_checks = db.Column(db.Integer, nullable=False, default=0)
+    healthy_checks = db.Column(db.Integer, nullable=False, default=0)
+    warning_checks = db.Column(db.Integer, nullable=False, default=0)
+    critical_checks = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<HealthCheckDailyStats {self.health_check_id} {self.date}>'
+
+class AlertDailyStats(db.Model):
+    """Daily alert counts per organization, rolled up from alerts"""
+    __tablename__ = 'alert_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('organization_id', 'date', name='uq_alert_daily_stats'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id', ondelete='CASCADE'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    
+    # Counts
+    total_alerts = db.Column(db.Integer, nullable=False, default=0)
+    critical_alerts = db.Column(db.Integer, nullable=False, default=0)
+    warning_alerts = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<AlertDailyStats {self.organization_id} {self.date}>'
@@ -1,4 +1,5 @@
 from app import db, bcrypt
+from app.models.functions import utcnow
 from datetime import datetime
 from enum import Enum
 
@@ -8,6 +9,9 @@ class RoleEnum(Enum):
     ANALYST = 'analyst'
     VIEWER = 'viewer'
 
+# Role names with manager rights
+MANAGER_ROLES = frozenset({RoleEnum.ADMIN.value, RoleEnum.MANAGER.value})
+
 class Role(db.Model):
     """User roles for RBAC"""
     __tablename__ = 'roles'
@@ -18,11 +22,16 @@ class Role(db.Model):
     permissions = db.Column(db.JSON)  # Store permissions as JSON
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    users = db.relationship('User', backref='role', lazy=True)
+    users = db.relationship('User', back_populates='role', lazy=True)
 
 class User(db.Model):
     """User model for authentication and authorization"""
     __tablename__ = 'users'
+    __table_args__ = (
+        # User listings filter by organization (and optionally role), newest first
+        db.Index('ix_users_org_created', 'organization_id', 'created_at'),
+        db.Index('ix_users_org_role_created', 'organization_id', 'role_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
@@ -34,16 +43,17 @@ class User(db.Model):
     is_verified = db.Column(db.Boolean, default=False)
     last_login = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=utcnow())
     
     # Foreign keys
     role_id = db.Column(db.Integer, db.ForeignKey('roles.id'), nullable=False)
     organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False)
     
     # Relationships
-    organization = db.relationship('Organization', backref='users')
+    role = db.relationship('Role', back_populates='users')
+    organization = db.relationship('Organization', back_populates='users')
     created_pipelines = db.relationship('Pipeline', backref='created_by_user', lazy=True)
-    created_alerts = db.relationship('Alert', backref='created_by_user', lazy=True)
+    created_alerts = db.relationship('Alert', backref='created_by_user', lazy=True, foreign_keys='Alert.created_by')
     
     @property
     def password(self):
@@ -51,10 +61,20 @@ class User(db.Model):
     
     @password.setter
     def password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = User.hash_password(password)
+    
+    @staticmethod
+    def hash_password(password):
+        """Hash a password with bcrypt; costs BCRYPT_LOG_ROUNDS (~250ms at 12 rounds)"""
+        return bcrypt.generate_password_hash(password).decode('utf-8')
+    
+    @staticmethod
+    def check_password(password_hash, password):
+        """Check a password against a stored bcrypt hash; as slow as hash_password"""
+        return bcrypt.check_password_hash(password_hash, password)
     
     def verify_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return User.check_password(self.password_hash, password)
     
     def has_permission(self, permission):
         """Check if user has specific permission"""
@@ -68,7 +88,7 @@ class User(db.Model):
     
     def is_manager(self):
         """Check if user is manager or admin"""
-        return self.role and self.role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value]
+        return self.role and self.role.name in MANAGER_ROLES
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -82,9 +102,9 @@ class User(db.Model):
             'is_verified': self.is_verified,
             'role': self.role.name if self.role else None,
             'organization_id': self.organization_id,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'last_login': self.last_login,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
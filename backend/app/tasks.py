@@ -0,0 +1,118 @@
+from app import celery, db
+from app.models import (
+    PipelineRun, HealthCheckResult, Alert,
+    PipelineDailyStats, HealthCheckDailyStats, AlertDailyStats
+)
+from app.models.pipeline import RunStatus
+from app.models.monitoring import HealthCheckStatus
+from app.models.alert import AlertSeverity
+from datetime import datetime, time, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+def _upsert_rollup(model, key_columns, rows):
+    """Build INSERT ... SELECT ... ON CONFLICT DO UPDATE writing aggregated rows into a rollup table"""
+    columns = [column.name for column in rows.selected_columns]
+    stmt = insert(model).from_select(columns, rows)
+    return stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: stmt.excluded[column] for column in columns if column not in key_columns}
+    )
+
+def _count_where(condition):
+    # COUNT(*) FILTER (WHERE ...) on Postgres
+    return func.count().filter(condition)
+
+@celery.task
+def refresh_daily_rollups(days=2):
+    """Recompute daily pipeline, health check and alert rollups for the last N days.
+    
+    Beat runs this every few minutes for today and yesterday (catching late updates);
+    call it once with a larger `days` (e.g. 365) to backfill history after creating
+    the tables with scripts/create_daily_rollup_tables.sql.
+    """
+    start_at = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), time.min)
+    
+    run_date = func.date(PipelineRun.started_at)
+    db.session.execute(_upsert_rollup(
+        PipelineDailyStats, ['organization_id', 'pipeline_id', 'date'],
+        select(
+            PipelineRun.organization_id.label('organization_id'),
+            PipelineRun.pipeline_id.label('pipeline_id'),
+            run_date.label('date'),
+            func.count().label('total_runs'),
+            _count_where(PipelineRun.status == RunStatus.SUCCESS).label('successful_runs'),
+            _count_where(PipelineRun.status == RunStatus.FAILED).label('failed_runs')
+        ).where(
+            PipelineRun.started_at >= start_at
+        ).group_by(PipelineRun.organization_id, PipelineRun.pipeline_id, run_date)
+    ))
+    
+    check_date = func.date(HealthCheckResult.checked_at)
+    db.session.execute(_upsert_rollup(
+        HealthCheckDailyStats, ['organization_id', 'health_check_id', 'date'],
+        select(
+            HealthCheckResult.organization_id.label('organization_id'),
+            HealthCheckResult.health_check_id.label('health_check_id'),
+            check_date.label('date'),
+            func.count().label('total_checks'),
+            _count_where(HealthCheckResult.status == HealthCheckStatus.HEALTHY).label('healthy_checks'),
+            _count_where(HealthCheckResult.status == HealthCheckStatus.WARNING).label('warning_checks'),
+            _count_where(HealthCheckResult.status == HealthCheckStatus.CRITICAL).label('critical_checks')
+        ).where(
+            HealthCheckResult.checked_at >= start_at
+        ).group_by(HealthCheckResult.organization_id, HealthCheckResult.health_check_id, check_date)
+    ))
+    
+    alert_date = func.date(Alert.created_at)
+    db.session.execute(_upsert_rollup(
+        AlertDailyStats, ['organization_id', 'date'],
+        select(
+            Alert.organization_id.label('organization_id'),
+            alert_date.label('date'),
+            func.count().label('total_alerts'),
+            _count_where(Alert.severity == AlertSeverity.CRITICAL).label('critical_alerts'),
+            _count_where(Alert.severity == AlertSeverity.WARNING).label('warning_alerts')
+        ).where(
+            Alert.created_at >= start_at
+        ).group_by(Alert.organization_id, alert_date)
+    ))
+    
+    db.session.commit()
+
+@celery.task
+def execute_pipeline(run_id):
+    """Execute a triggered pipeline run queued by the trigger endpoint"""
+    run = db.session.get(PipelineRun, run_id)
+    if not run or run.status != RunStatus.PENDING:
+        # Already picked up (redelivery after a worker crash) or deleted
+        return
+    
+    run.status = RunStatus.RUNNING
+    run.started_at = datetime.utcnow()
+    run.pipeline.last_run_at = run.started_at
+    db.session.commit()
+    
+    # Pipeline types have no executors yet, so the run completes as a mock success
+    run.status = RunStatus.SUCCESS
+    run.completed_at = datetime.utcnow()
+    run.duration_seconds = (run.completed_at - run.started_at).total_seconds()
+    db.session.commit()
+
+@celery.task
+def execute_health_check(result_id):
+    """Execute a health check run queued by the run endpoint, filling in its pending result"""
+    result = db.session.get(HealthCheckResult, result_id)
+    if not result or result.duration_seconds is not None:
+        # Already executed (redelivery after a worker crash) or deleted
+        return
+    
+    # Check types have no executors yet, so record a mock healthy result
+    result.status = HealthCheckStatus.HEALTHY
+    result.checked_at = datetime.utcnow()
+    result.duration_seconds = 1.5
+    result.metric_value = 100.0
+    result.metric_unit = 'records'
+    result.message = 'Health check completed successfully'
+    result.details = {'tested_at': result.checked_at.isoformat()}
+    db.session.commit()
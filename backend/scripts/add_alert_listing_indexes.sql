@@ -0,0 +1,16 @@
+-- Add the alert, alert rule and alert history listing indexes for databases created before
+-- they existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alerts_org_created
+    ON alerts (organization_id, created_at, id) INCLUDE (status, severity);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alerts_org_status_created
+    ON alerts (organization_id, status, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alerts_org_severity_created
+    ON alerts (organization_id, severity, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alert_rules_org_created
+    ON alert_rules (organization_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alert_rules_org_type_created
+    ON alert_rules (organization_id, rule_type, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alert_history_alert_created
+    ON alert_history (alert_id, created_at);
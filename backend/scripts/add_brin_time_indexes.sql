@@ -0,0 +1,8 @@
+-- Add BRIN indexes on the append-only result and metric timestamps for databases created
+-- before the indexes existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_health_check_results_checked_brin
+    ON health_check_results USING brin (checked_at) WITH (pages_per_range = 32);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipeline_metrics_recorded_brin
+    ON pipeline_metrics USING brin (recorded_at) WITH (pages_per_range = 32);
@@ -0,0 +1,14 @@
+-- Add the dashboard range scan and counter indexes for databases created before they
+-- existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipeline_runs_pipeline_started
+    ON pipeline_runs (pipeline_id, started_at, id) INCLUDE (status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_health_check_results_check_checked
+    ON health_check_results (health_check_id, checked_at, id) INCLUDE (status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipelines_org_status
+    ON pipelines (organization_id, status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_data_sources_org_active
+    ON data_sources (organization_id, is_active);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_health_checks_org_active
+    ON health_checks (organization_id, is_active);
@@ -0,0 +1,12 @@
+-- Add the (parent, created_at, id) indexes behind keyset cursor pagination for databases
+-- created before they existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipelines_org_created
+    ON pipelines (organization_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_data_sources_org_created
+    ON data_sources (organization_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_health_checks_org_created
+    ON health_checks (organization_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipeline_metrics_pipeline_recorded
+    ON pipeline_metrics (pipeline_id, recorded_at, id);
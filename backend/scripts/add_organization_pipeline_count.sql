@@ -0,0 +1,9 @@
+-- Add the denormalized pipeline counter to organizations for databases created before it
+-- existed, seeded from the current pipeline rows. The create and delete endpoints keep it
+-- up to date from then on.
+
+ALTER TABLE organizations ADD COLUMN IF NOT EXISTS pipeline_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE organizations o SET pipeline_count = (
+    SELECT count(*) FROM pipelines p WHERE p.organization_id = o.id
+);
@@ -0,0 +1,13 @@
+-- Add the partial indexes on failed pipeline runs and unhealthy health check results for
+-- databases created before they existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+--
+-- The enum columns store member names, so the predicates compare against those. A
+-- ix_pipeline_runs_failed built from the earlier FAILED-only definition must be dropped
+-- first (DROP INDEX CONCURRENTLY ix_pipeline_runs_failed;).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipeline_runs_failed
+    ON pipeline_runs (pipeline_id, started_at) WHERE status IN ('FAILED', 'TIMEOUT');
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_health_check_results_unhealthy
+    ON health_check_results (health_check_id, checked_at) INCLUDE (status)
+    WHERE status IN ('WARNING', 'CRITICAL');
@@ -0,0 +1,10 @@
+-- Enforce per-organization unique pipeline and data source names for databases created
+-- before the constraints existed. The API now relies on them instead of checking for an
+-- existing name before each write. Resolve any duplicate names first; these queries list them:
+--   SELECT organization_id, name FROM pipelines GROUP BY 1, 2 HAVING count(*) > 1;
+--   SELECT organization_id, name FROM data_sources GROUP BY 1, 2 HAVING count(*) > 1;
+
+ALTER TABLE pipelines
+    ADD CONSTRAINT uq_pipelines_org_name UNIQUE (organization_id, name);
+ALTER TABLE data_sources
+    ADD CONSTRAINT uq_data_sources_org_name UNIQUE (organization_id, name);
@@ -0,0 +1,10 @@
+-- Add the user listing and alert cooldown indexes for databases created before they
+-- existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_org_created
+    ON users (organization_id, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_org_role_created
+    ON users (organization_id, role_id, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alerts_rule_created
+    ON alerts (alert_rule_id, created_at);
@@ -0,0 +1,38 @@
+-- Create the daily rollup tables read by the dashboard metrics and top-pipelines endpoints
+-- for databases created before they existed. refresh_daily_rollups keeps the last two days
+-- up to date from beat, so history has to be backfilled once after running this, e.g.:
+--
+--   celery -A app.celery call app.tasks.refresh_daily_rollups --kwargs '{"days": 365}'
+
+CREATE TABLE IF NOT EXISTS pipeline_daily_stats (
+    id SERIAL PRIMARY KEY,
+    organization_id INTEGER NOT NULL REFERENCES organizations (id) ON DELETE CASCADE,
+    pipeline_id INTEGER NOT NULL REFERENCES pipelines (id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    total_runs INTEGER NOT NULL DEFAULT 0,
+    successful_runs INTEGER NOT NULL DEFAULT 0,
+    failed_runs INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT uq_pipeline_daily_stats UNIQUE (organization_id, pipeline_id, date)
+);
+
+CREATE TABLE IF NOT EXISTS health_check_daily_stats (
+    id SERIAL PRIMARY KEY,
+    organization_id INTEGER NOT NULL REFERENCES organizations (id) ON DELETE CASCADE,
+    health_check_id INTEGER NOT NULL REFERENCES health_checks (id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    total_checks INTEGER NOT NULL DEFAULT 0,
+    healthy_checks INTEGER NOT NULL DEFAULT 0,
+    warning_checks INTEGER NOT NULL DEFAULT 0,
+    critical_checks INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT uq_health_check_daily_stats UNIQUE (organization_id, health_check_id, date)
+);
+
+CREATE TABLE IF NOT EXISTS alert_daily_stats (
+    id SERIAL PRIMARY KEY,
+    organization_id INTEGER NOT NULL REFERENCES organizations (id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    total_alerts INTEGER NOT NULL DEFAULT 0,
+    critical_alerts INTEGER NOT NULL DEFAULT 0,
+    warning_alerts INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT uq_alert_daily_stats UNIQUE (organization_id, date)
+);
@@ -0,0 +1,25 @@
+-- Backfill organization_id onto pipeline runs, pipeline metrics and health check results
+-- for databases created before the column existed. Run with psql outside a transaction
+-- (CREATE INDEX CONCURRENTLY cannot run inside one).
+
+ALTER TABLE pipeline_runs ADD COLUMN IF NOT EXISTS organization_id INTEGER REFERENCES organizations (id);
+ALTER TABLE pipeline_metrics ADD COLUMN IF NOT EXISTS organization_id INTEGER REFERENCES organizations (id);
+ALTER TABLE health_check_results ADD COLUMN IF NOT EXISTS organization_id INTEGER REFERENCES organizations (id);
+
+UPDATE pipeline_runs r SET organization_id = p.organization_id
+FROM pipelines p WHERE p.id = r.pipeline_id AND r.organization_id IS NULL;
+
+UPDATE pipeline_metrics m SET organization_id = p.organization_id
+FROM pipelines p WHERE p.id = m.pipeline_id AND m.organization_id IS NULL;
+
+UPDATE health_check_results r SET organization_id = c.organization_id
+FROM health_checks c WHERE c.id = r.health_check_id AND r.organization_id IS NULL;
+
+ALTER TABLE pipeline_runs ALTER COLUMN organization_id SET NOT NULL;
+ALTER TABLE pipeline_metrics ALTER COLUMN organization_id SET NOT NULL;
+ALTER TABLE health_check_results ALTER COLUMN organization_id SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pipeline_runs_org_started
+    ON pipeline_runs (organization_id, started_at) INCLUDE (status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_health_check_results_org_checked
+    ON health_check_results (organization_id, checked_at) INCLUDE (status);
@@ -0,0 +1,10 @@
+-- Resynchronize the denormalized organizations.pipeline_count with the pipeline rows, e.g.
+-- after pipelines were created or deleted outside the API. Pipelines created or deleted
+-- while it runs can still be miscounted, so run it when nothing is changing pipelines.
+
+UPDATE organizations o SET pipeline_count = (
+    SELECT count(*) FROM pipelines p WHERE p.organization_id = o.id
+)
+WHERE pipeline_count IS DISTINCT FROM (
+    SELECT count(*) FROM pipelines p WHERE p.organization_id = o.id
+);
@@ -1,6 +1,7 @@
 import pytest
 import tempfile
 import os
+import json
 from flask import Flask
 from app import create_app, db
 from app.models.user import User
@@ -9,6 +10,8 @@ from app.models.pipeline import Pipeline, PipelineRun
 from app.models.monitoring import DataSource, HealthCheck
 from app.models.alert import AlertRule, Alert
 from flask_bcrypt import Bcrypt
+from sqlalchemy import event
+from contextlib import contextmanager
 import jwt
 from datetime import datetime, timedelta
 
@@ -137,6 +140,21 @@ def admin_headers(app, admin_user):
         )
         return {'Authorization': f'Bearer {access_token}'}
 
+@pytest.fixture
+def registered_user(client):
+    """Register a user and organization through the API, returning the body and auth headers."""
+    response = client.post('/api/auth/register', json={
+        'email': 'owner@example.com',
+        'username': 'owner',
+        'password': 'Passw0rdX',
+        'first_name': 'Owner',
+        'last_name': 'User',
+        'organization_name': 'Owner Organization'
+    })
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    return data, {'Authorization': f"Bearer {data['access_token']}"}
+
 @pytest.fixture
 def test_pipeline(app, test_user, test_organization):
     """Create a test pipeline."""
@@ -301,6 +319,24 @@ def sample_alert_rule_data():
         'enabled': True
     }
 
+@pytest.fixture
+def count_queries(app):
+    """Context manager collecting the SQL statements executed while it is active."""
+    @contextmanager
+    def counter():
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    
+    return counter
+
 @pytest.fixture
 def mock_celery(mocker):
     """Mock Celery for testing background tasks."""
@@ -4,9 +4,11 @@ from datetime import datetime, timedelta
 from app import db
 from app.models.user import User
 from app.models.organization import Organization
-from app.models.pipeline import Pipeline, PipelineRun
+from app.models.pipeline import Pipeline, PipelineRun, PipelineType
 from app.models.monitoring import DataSource, HealthCheck
-from app.models.alert import AlertRule, Alert
+from app.models.alert import AlertRule, Alert, AlertHistory, AlertSeverity
+from app.tasks import execute_pipeline
+from flask_jwt_extended import decode_token
 
 class TestAuthAPI:
     """Test cases for authentication API endpoints."""
@@ -111,6 +113,24 @@ class TestAuthAPI:
         result = json.loads(response.data)
         assert result['message'] == 'Profile updated successfully'
         assert result['user']['first_name'] == 'Updated'
+    
+    def test_refresh_rebuilds_claims_and_rejects_inactive_users(self, client, registered_user):
+        """Test that refresh reissues claims from the user row and stops for deactivated users."""
+        
+        data, headers = registered_user
+        refresh_headers = {'Authorization': f"Bearer {data['refresh_token']}"}
+        
+        response = client.post('/api/auth/refresh', headers=refresh_headers)
+        assert response.status_code == 200
+        claims = decode_token(json.loads(response.data)['access_token'])
+        assert claims['org_id'] == data['organization']['id']
+        assert 'username' not in claims and 'role' not in claims
+        
+        user = db.session.get(User, data['user']['id'])
+        user.is_active = False
+        db.session.commit()
+        
+        assert client.post('/api/auth/refresh', headers=refresh_headers).status_code == 401
 
 class TestPipelinesAPI:
     """Test cases for pipelines API endpoints."""
@@ -216,11 +236,12 @@ class TestPipelinesAPI:
         """Test triggering a pipeline."""
         response = client.post(f'/api/pipelines/{test_pipeline.id}/trigger', 
                              headers=auth_headers)
-        assert response.status_code == 200
+        assert response.status_code == 202
         
         result = json.loads(response.data)
         assert result['message'] == 'Pipeline triggered successfully'
-        assert 'task_id' in result
+        assert result['run']['status'] == 'pending'
+        assert response.headers['Location'].endswith(result['status_url'])
     
     def test_get_pipeline_metrics(self, client, auth_headers, test_pipeline):
         """Test getting pipeline metrics."""
@@ -230,6 +251,100 @@ class TestPipelinesAPI:
         
         result = json.loads(response.data)
         assert 'metrics' in result
+    
+    def test_pipeline_keyset_cursor_pages_through_ties(self, client, registered_user):
+        """Test that cursor pages neither skip nor repeat pipelines sharing a created_at."""
+        
+        data, headers = registered_user
+        created_at = datetime(2024, 1, 1)
+        db.session.add_all([
+            Pipeline(
+                name=f'Keyset Pipeline {i}',
+                pipeline_type=PipelineType.ETL,
+                organization_id=data['organization']['id'],
+                created_by=data['user']['id'],
+                created_at=created_at
+            )
+            for i in range(25)
+        ])
+        db.session.commit()
+        
+        seen, cursor, pages = [], '', 0
+        while cursor is not None:
+            response = client.get(f'/api/pipelines/?per_page=10&cursor={cursor}', headers=headers)
+            assert response.status_code == 200
+            result = json.loads(response.data)
+            seen += [pipeline['id'] for pipeline in result['pipelines']]
+            cursor = result['pagination']['next_cursor']
+            pages += 1
+        
+        assert pages == 3
+        assert len(seen) == len(set(seen)) == 25
+        assert seen == sorted(seen, reverse=True)
+        
+        response = client.get('/api/pipelines/?cursor=not-a-cursor', headers=headers)
+        assert response.status_code == 400
+    
+    def test_trigger_queues_run_and_returns_location(self, client, registered_user, monkeypatch):
+        """Test that triggering returns 202 with a status URL and the queued run reaches a terminal status."""
+        
+        # Record the enqueued run instead of sending it to a broker, then run the task inline
+        queued = []
+        monkeypatch.setattr(execute_pipeline, 'delay', queued.append)
+        data, headers = registered_user
+        response = client.post('/api/pipelines/', json={'name': 'Queued', 'pipeline_type': 'etl'}, headers=headers)
+        pipeline_id = json.loads(response.data)['pipeline']['id']
+        
+        response = client.post(f'/api/pipelines/{pipeline_id}/trigger', json={}, headers=headers)
+        assert response.status_code == 202
+        result = json.loads(response.data)
+        assert response.headers['Location'].endswith(result['status_url'])
+        assert result['run']['status'] == 'pending'
+        assert queued == [result['run']['id']]
+        
+        execute_pipeline.run(result['run']['id'])
+        
+        run = json.loads(client.get(result['status_url'], headers=headers).data)['run']
+        assert run['status'] == 'success'
+        assert run['completed_at'] is not None
+        assert run['duration_seconds'] is not None
+    
+    def test_invalid_body_returns_field_errors(self, client, registered_user):
+        """Test that schema validation failures return 400 with per-field details."""
+        
+        data, headers = registered_user
+        response = client.post('/api/pipelines/', json={'name': 'Bad', 'pipeline_type': 'bogus'}, headers=headers)
+        
+        assert response.status_code == 400
+        result = json.loads(response.data)
+        assert result['error'].startswith('Invalid pipeline_type')
+        assert [detail['field'] for detail in result['details']] == ['pipeline_type']
+    
+    def test_pipeline_limit_reserves_slots(self, client, registered_user):
+        """Test that creates stop at the tier limit and deletes free a slot."""
+        
+        data, headers = registered_user
+        org_id = data['organization']['id']
+        
+        # Registration creates a starter organization, limited to 10 pipelines
+        for i in range(10):
+            response = client.post('/api/pipelines/', json={'name': f'Limit {i}', 'pipeline_type': 'etl'},
+                                   headers=headers)
+            assert response.status_code == 201
+        
+        response = client.post('/api/pipelines/', json={'name': 'Limit 10', 'pipeline_type': 'etl'},
+                               headers=headers)
+        assert response.status_code == 403
+        assert db.session.get(Organization, org_id).pipeline_count == 10
+        
+        pipeline_id = json.loads(client.get('/api/pipelines/', headers=headers).data)['pipelines'][0]['id']
+        assert client.delete(f'/api/pipelines/{pipeline_id}', headers=headers).status_code == 200
+        db.session.expire_all()
+        assert db.session.get(Organization, org_id).pipeline_count == 9
+        
+        response = client.post('/api/pipelines/', json={'name': 'Limit 10', 'pipeline_type': 'etl'},
+                               headers=headers)
+        assert response.status_code == 201
 
 class TestMonitoringAPI:
     """Test cases for monitoring API endpoints."""
@@ -434,6 +549,31 @@ class TestAlertsAPI:
         
         result = json.loads(response.data)
         assert 'alerts' in result
+    
+    def test_alert_transitions_apply_once(self, client, registered_user):
+        """Test that acknowledge/resolve update only alerts not already in the target status."""
+        
+        data, headers = registered_user
+        org_id, user_id = data['organization']['id'], data['user']['id']
+        rule = AlertRule(name='Transition Rule', rule_type='pipeline_failure', conditions={'status': 'failed'},
+                         organization_id=org_id, created_by=user_id)
+        db.session.add(rule)
+        db.session.flush()
+        alert = Alert(alert_rule_id=rule.id, title='Transition', message='m', severity=AlertSeverity.CRITICAL,
+                      organization_id=org_id, created_by=user_id)
+        db.session.add(alert)
+        db.session.commit()
+        alert_id = alert.id
+        
+        assert client.post(f'/api/alerts/{alert_id}/acknowledge', headers=headers).status_code == 200
+        assert client.post(f'/api/alerts/{alert_id}/acknowledge', headers=headers).status_code == 400
+        assert client.post(f'/api/alerts/{alert_id}/resolve', headers=headers).status_code == 200
+        assert client.post(f'/api/alerts/{alert_id}/resolve', headers=headers).status_code == 400
+        assert client.post('/api/alerts/999999/resolve', headers=headers).status_code == 404
+        
+        history = AlertHistory.query.filter_by(alert_id=alert_id).order_by(AlertHistory.id).all()
+        assert [entry.action for entry in history] == ['acknowledged', 'resolved']
+        assert history[0].description == 'Alert acknowledged by owner'
 
 class TestDashboardAPI:
     """Test cases for dashboard API endpoints."""
@@ -481,6 +621,33 @@ class TestDashboardAPI:
         
         result = json.loads(response.data)
         assert 'pipelines' in result
+    
+    def test_recent_activity_cursor_pages_through_ties(self, client, registered_user):
+        """Test that the activity feed cursor keeps runs and alerts sharing a timestamp."""
+        
+        data, headers = registered_user
+        org_id, user_id = data['organization']['id'], data['user']['id']
+        timestamp = datetime(2024, 1, 1)
+        
+        pipeline = Pipeline(name='Feed Pipeline', pipeline_type=PipelineType.ETL,
+                            organization_id=org_id, created_by=user_id)
+        rule = AlertRule(name='Feed Rule', rule_type='pipeline_failure', conditions={'status': 'failed'},
+                         organization_id=org_id, created_by=user_id)
+        db.session.add_all([pipeline, rule])
+        db.session.flush()
+        for i in range(15):
+            db.session.add(PipelineRun(pipeline_id=pipeline.id, organization_id=org_id, started_at=timestamp))
+            db.session.add(Alert(alert_rule_id=rule.id, title=f'Alert {i}', message='m', severity=AlertSeverity.INFO,
+                                 organization_id=org_id, created_by=user_id, created_at=timestamp))
+        db.session.commit()
+        
+        seen, url = [], '/api/dashboard/recent-activity'
+        while url:
+            result = json.loads(client.get(url, headers=headers).data)
+            seen += [(activity['type'], activity['data']['id']) for activity in result['activities']]
+            url = result['next_cursor'] and f"/api/dashboard/recent-activity?cursor={result['next_cursor']}"
+        
+        assert len(seen) == len(set(seen)) == 30
 
 class TestUsersAPI:
     """Test cases for users API endpoints."""
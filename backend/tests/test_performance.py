@@ -4,7 +4,7 @@ import threading
 import concurrent.futures
 from datetime import datetime, timedelta
 from app import db
-from app.models.user import User
+from app.models.user import User, Role
 from app.models.organization import Organization
 from app.models.pipeline import Pipeline, PipelineRun
 from app.models.monitoring import DataSource, HealthCheck
@@ -232,8 +232,8 @@ class TestConcurrentAccess:
             futures = [executor.submit(trigger_pipeline) for _ in range(5)]
             results = [future.result() for future in concurrent.futures.as_completed(futures)]
         
-        # All requests should succeed
-        assert all(status == 200 for status in results)
+        # All requests should be accepted for background execution
+        assert all(status == 202 for status in results)
     
     def test_concurrent_health_check_execution(self, client, auth_headers, test_health_check):
         """Test concurrent health check execution."""
@@ -278,7 +278,7 @@ class TestDatabasePerformance:
         
         # Test paginated query performance
         start_time = time.time()
-        response = client.get('/api/pipelines?page=1&per_page=50', headers=auth_headers)
+        response = client.get('/api/pipelines?page=1&per_page=50&include_total=true', headers=auth_headers)
         end_time = time.time()
         
         assert response.status_code == 200
@@ -289,6 +289,52 @@ class TestDatabasePerformance:
         assert 'pagination' in result
         assert result['pagination']['total'] == 1000
     
+    def test_user_list_query_count(self, client, count_queries):
+        """Test that listing users runs a fixed number of queries (no N+1 on roles)."""
+        
+        # Registering creates the organization with an admin, who may list users
+        response = client.post('/api/auth/register', json={
+            'email': 'lister@example.com',
+            'username': 'lister',
+            'password': 'Passw0rdX',
+            'first_name': 'List',
+            'last_name': 'Owner',
+            'organization_name': 'Listing Org'
+        })
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        headers = {'Authorization': f"Bearer {data['access_token']}"}
+        
+        role = Role(name='viewer', permissions=['view_dashboard'])
+        db.session.add(role)
+        db.session.flush()
+        
+        users = []
+        for i in range(100):
+            user = User(
+                email=f'list_user_{i}@example.com',
+                username=f'list_user_{i}',
+                first_name='List',
+                last_name=f'User {i}',
+                role_id=role.id,
+                organization_id=data['organization']['id'],
+                password_hash='x'
+            )
+            users.append(user)
+        
+        db.session.add_all(users)
+        db.session.commit()
+        
+        # The page is streamed, so read the body inside the counter. Identity, count and page,
+        # plus one roles selectin per 50-row batch; lazy loads raise under RAISE_ON_LAZY_LOAD
+        with count_queries() as queries:
+            response = client.get('/api/users/?per_page=100', headers=headers)
+            result = json.loads(response.data)
+        
+        assert response.status_code == 200
+        assert len(result['users']) == 100
+        assert len(queries) <= 5
+    
     def test_complex_join_query_performance(self, client, auth_headers, test_organization):
         """Test performance of complex join queries."""
         
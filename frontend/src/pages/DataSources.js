@@ -30,7 +30,7 @@ const DataSources = () => {
   // Fetch data sources
   const { data: dataSourcesData, isLoading, error } = useQuery(
     ['data-sources', filters, page],
-    () => monitoringAPI.getDataSources({ ...filters, page, per_page: 20 }),
+    () => monitoringAPI.getDataSources({ ...filters, page, per_page: 20, include_total: true }),
     { keepPreviousData: true }
   );
 
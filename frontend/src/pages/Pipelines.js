@@ -32,7 +32,7 @@ const Pipelines = () => {
   // Fetch pipelines
   const { data: pipelinesData, isLoading, error } = useQuery(
     ['pipelines', filters, page],
-    () => pipelinesAPI.getAll({ ...filters, page, per_page: 20 }),
+    () => pipelinesAPI.getAll({ ...filters, page, per_page: 20, include_total: true }),
     { keepPreviousData: true }
   );
 